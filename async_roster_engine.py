@@ -0,0 +1,329 @@
+import asyncio
+import os
+import re
+import sys
+import time
+from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+import claimer_log
+from claimer_log import fields, log
+from render_shift_claimer import (
+    CLAIM_OUTCOME_JS,
+    CLICK_START_JS,
+    DIALOG_SELECTORS,
+    EXTRACT_SHIFTS_JS,
+    MAX_RUNTIME_HOURS,
+    ROSTER_READY_JS,
+    SCAN_INTERVAL,
+    SHIFT_CANDIDATE_SELECTOR,
+    SHIFT_URL,
+    WAIT_TIMEOUTS,
+    RenderShiftAutoClaimer,
+)
+from shift_index import SeenShiftIndex
+import shift_parser
+from shift_store import roster_key
+
+# ================= CONFIG =================
+SHIFT_URLS = [SHIFT_URL]  # One entry per employee/location roster
+PAGE_TIMEOUT = 45000  # milliseconds for navigation and element actions
+OPEN_RETRY_DELAY = 5  # seconds before retrying a roster that failed to open (doubles per failure)
+OPEN_RETRY_MAX_DELAY = 300  # longest wait between attempts to open a roster
+# =========================================
+
+CONFIRM_TEXT = re.compile(r"^\s*(ok|confirm|yes|agree)\b", re.IGNORECASE)
+
+
+# ================= PER-ROSTER WATCHER =================
+class AsyncRosterWatcher:
+    """Scans and claims one roster inside its own browser context.
+
+    With a shared ShiftStore, a shift is only processed if no other worker
+    has recorded it yet; scan_counter (a multiprocessing.Value) counts scans
+    for the supervisor's throughput report.
+    """
+
+    def __init__(self, url, name, store=None, scan_counter=None):
+        self.url = url
+        self.name = name
+        self.roster = roster_key(url)
+        self.store = store
+        self.scan_counter = scan_counter
+        self.context = None
+        self.page = None
+        self.seen_shifts = SeenShiftIndex()
+        self.claimed_shifts = set()
+        self.scan_count = 0
+        self.error_count = 0
+
+    def fields(self, **values):
+        """Structured log fields tagged with this watcher's roster"""
+        return fields(roster=self.name, **values)
+
+    async def open(self, browser):
+        """Create an isolated context for this roster and load it"""
+        if self.context:
+            try:
+                await self.context.close()
+            except:
+                pass
+        self.context = await browser.new_context()
+        self.page = await self.context.new_page()
+        self.page.set_default_timeout(PAGE_TIMEOUT)
+        await self.page.goto(self.url, wait_until="load", timeout=PAGE_TIMEOUT)
+        await self.wait_for_roster()
+
+    async def open_until_loaded(self, browser, deadline):
+        """open() with back-off until it succeeds; returns False if the deadline passes first.
+
+        A roster that can't be opened (network hiccup, login page timing out)
+        keeps being retried rather than ending the watcher, which the
+        supervisor would never restart.
+        """
+        delay = OPEN_RETRY_DELAY
+        while time.time() < deadline:
+            try:
+                await self.open(browser)
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not browser.is_connected():
+                    raise
+                self.error_count += 1
+                log.error(f"[{self.name}] [ERROR] Roster failed to open: {str(e)[:100]} (retrying in {delay}s)",
+                          extra=self.fields(event="open_failed", retry_in=delay))
+                await asyncio.sleep(min(delay, max(deadline - time.time(), 0)))
+                delay = min(delay * 2, OPEN_RETRY_MAX_DELAY)
+        return False
+
+    async def close(self):
+        if self.context:
+            await self.context.close()
+            self.context = None
+
+    async def wait_for_roster(self):
+        try:
+            await self.page.wait_for_function(ROSTER_READY_JS, polling=100, timeout=WAIT_TIMEOUTS['roster'])
+        except PlaywrightTimeoutError:
+            pass
+
+    async def refresh(self):
+        await self.page.reload(wait_until="domcontentloaded", timeout=20000)
+        await self.wait_for_roster()
+
+    async def scan(self):
+        """Collect new shifts on this roster and claim the claimable ones"""
+        self.scan_count += 1
+        self.seen_shifts.expire()
+        records = await self.page.evaluate(EXTRACT_SHIFTS_JS, {
+            'selector': SHIFT_CANDIDATE_SELECTOR,
+            'minLength': 20
+        })
+
+        detected_at = time.perf_counter()
+        new_shifts = []
+        seen_infos = set()
+        for record in records:
+            shift_id = shift_parser.shift_id(record['text'])
+            if self.seen_shifts.seen(shift_id):
+                continue
+
+            status = RenderShiftAutoClaimer.status_from_record(record)
+            parsed = shift_parser.parse_shift(record['text'])
+            shift_day = parsed.date.toordinal() if parsed.date else 0
+            if self.seen_shifts.is_past(shift_day):
+                continue
+            shift_info = parsed.info
+            self.seen_shifts.add(shift_id, status, shift_info, shift_day=shift_day)
+            if self.store:
+                first_seen = self.store.mark_seen(self.roster, shift_id, status, shift_info)
+                if status == "MY CLAIM":
+                    # New or never claimed: only the worker holding the claim lease goes on
+                    if not self.store.start_claim(self.roster, shift_id):
+                        continue
+                elif not first_seen:
+                    # Already reported by another (or a previous) worker
+                    continue
+
+            if shift_info and shift_info not in seen_infos:
+                seen_infos.add(shift_info)
+                new_shifts.append({
+                    'id': shift_id,
+                    'info': shift_info,
+                    'status': status,
+                    'claim_selector': f'[data-glee-claim~="{record["key"]}"]' if record['claimable'] else None,
+                    'detected_at': detected_at,
+                    'shift': parsed
+                })
+
+        claimable = [s for s in new_shifts if s['status'] == "MY CLAIM"]
+        if new_shifts:
+            log.debug(f"[{self.name}] 📊 {len(new_shifts)} new shift(s), {len(claimable)} claimable",
+                      extra=self.fields(event="new_shifts", new=len(new_shifts), claimable=len(claimable)))
+        for shift in claimable:
+            if await self.claim(shift):
+                self.claimed_shifts.add(shift['id'])
+                if self.store:
+                    self.store.mark_claimed(self.roster, shift['id'])
+            elif self.store:
+                self.store.release_claim(self.roster, shift['id'])
+        if self.scan_counter is not None:
+            with self.scan_counter.get_lock():
+                self.scan_counter.value += 1
+        return new_shifts
+
+    async def claim(self, shift):
+        """Click the claim control captured for a shift and confirm any dialog"""
+        button = self.page.locator(shift['claim_selector'])
+        try:
+            log.debug(f"[{self.name}] [CLAIMING] {shift['info'][:60]}...")
+            since = await self.page.evaluate(CLICK_START_JS)
+            detect_to_click = time.perf_counter() - shift['detected_at']
+            await button.click(delay=30, timeout=WAIT_TIMEOUTS['claim'])
+            outcome = await self.wait_for_outcome(since, WAIT_TIMEOUTS['claim'], accept_dialog=True)
+
+            dialog = self.page.locator(", ".join(f"{selector}:visible" for selector in DIALOG_SELECTORS)).first
+            if outcome == 'dialog' or await dialog.count():
+                # A dialog counts only once confirmed, and then by the confirm's response
+                outcome = None
+                confirm = dialog.locator("button:visible").filter(has_text=CONFIRM_TEXT).first
+                if not await confirm.count():
+                    confirm = dialog.locator("button[type='submit']:visible").first
+                if await confirm.count():
+                    since = await self.page.evaluate(CLICK_START_JS)
+                    await confirm.click(delay=20)
+                    outcome = await self.wait_for_outcome(since, WAIT_TIMEOUTS['confirm'])
+
+            if outcome is None:
+                log.warning(f"[{self.name}] [FAILED] Not confirmed: {shift['info'][:50]}",
+                            extra=self.fields(event="claim_failed", shift=shift['id']))
+                return False
+            log.info(f"[{self.name}] [SUCCESS] Claimed: {shift['info'][:50]} "
+                     f"(clicked {detect_to_click * 1000:.0f}ms after detection)",
+                     extra=self.fields(event="claim", shift=shift['id'],
+                                       detect_to_click_ms=round(detect_to_click * 1000)))
+            return True
+        except Exception as e:
+            log.error(f"[{self.name}] [ERROR] Claim failed: {str(e)[:50]}", extra=self.fields(shift=shift['id']))
+            return False
+
+    async def wait_for_outcome(self, since, timeout, accept_dialog=False):
+        try:
+            handle = await self.page.wait_for_function(
+                CLAIM_OUTCOME_JS,
+                arg={'dialogSelector': ", ".join(DIALOG_SELECTORS), 'since': since, 'acceptDialog': accept_dialog},
+                polling=50,
+                timeout=timeout
+            )
+            return await handle.json_value()
+        except PlaywrightTimeoutError:
+            return None
+
+    async def run(self, browser, deadline, start_delay=0):
+        """Scan this roster until the deadline, recovering from page failures"""
+        await asyncio.sleep(start_delay)
+        if not await self.open_until_loaded(browser, deadline):
+            return
+        log.info(f"[{self.name}] ✅ Roster loaded", extra=self.fields(event="loaded"))
+
+        while time.time() < deadline:
+            try:
+                scan_start = time.time()
+                await self.scan()
+                scan_time = time.time() - scan_start
+                log.info(f"[{self.name}] 🔍 Scan #{self.scan_count} in {scan_time:.2f}s "
+                         f"({len(self.seen_shifts)} seen, {len(self.claimed_shifts)} claimed)",
+                         extra=self.fields(event="scan", scan=self.scan_count, seconds=round(scan_time, 3),
+                                           seen=len(self.seen_shifts), claimed=len(self.claimed_shifts)))
+                await asyncio.sleep(SCAN_INTERVAL)
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.error_count += 1
+                log.error(f"[{self.name}] [ERROR] Scan error: {str(e)[:100]}", extra=self.fields(event="error"))
+                try:
+                    await self.refresh()
+                except Exception:
+                    log.warning(f"[{self.name}] 🔄 Reopening roster context...", extra=self.fields(event="reopen"))
+                    if not await self.open_until_loaded(browser, deadline):
+                        return
+
+
+# ================= ENGINE =================
+class AsyncRosterEngine:
+    """Runs one watcher per roster URL, all sharing a single Chromium"""
+
+    def __init__(self, urls, store=None, scan_counter=None, name_prefix="roster"):
+        self.urls = urls
+        self.watchers = [
+            AsyncRosterWatcher(url, f"{name_prefix}-{i}", store=store, scan_counter=scan_counter)
+            for i, url in enumerate(urls, 1)
+        ]
+        self.start_time = None
+
+    async def run(self):
+        self.start_time = time.time()
+        deadline = self.start_time + MAX_RUNTIME_HOURS * 3600
+        is_render = os.getenv('RENDER') is not None
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(
+                headless=is_render,
+                args=[
+                    "--disable-blink-features=AutomationControlled",
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-gpu"
+                ]
+            )
+            log.info(f"✅ Browser launched, watching {len(self.watchers)} roster(s)")
+
+            # Stagger start-up so the rosters don't all reload at once
+            stagger = SCAN_INTERVAL / max(len(self.watchers), 1)
+            tasks = [
+                asyncio.create_task(watcher.run(browser, deadline, start_delay=i * stagger))
+                for i, watcher in enumerate(self.watchers)
+            ]
+            try:
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                for watcher, result in zip(self.watchers, results):
+                    if isinstance(result, Exception):
+                        log.error(f"[{watcher.name}] ❌ Stopped: {result}", extra=watcher.fields(event="stopped"))
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await browser.close()
+
+    def show_statistics(self):
+        runtime = time.time() - self.start_time if self.start_time else 0
+        lines = [f"📊 FINAL STATISTICS ({runtime / 3600:.1f} hours):"]
+        for watcher in self.watchers:
+            lines.append(f"   {watcher.name}: {watcher.scan_count} scans, {len(watcher.seen_shifts)} seen, "
+                         f"{len(watcher.claimed_shifts)} claimed, {watcher.error_count} errors")
+        log.info("\n".join(lines), extra=fields(event="stop", runtime=round(runtime), rosters={
+            watcher.name: {'scans': watcher.scan_count, 'seen': len(watcher.seen_shifts),
+                           'claimed': len(watcher.claimed_shifts), 'errors': watcher.error_count}
+            for watcher in self.watchers}))
+
+
+# ================= MAIN =================
+def main():
+    claimer_log.setup()
+    log.info(f"🚀 Async multi-roster auto-claimer starting: {len(SHIFT_URLS)} roster(s) "
+             f"for up to {MAX_RUNTIME_HOURS}h",
+             extra=fields(event="start", rosters=len(SHIFT_URLS), max_runtime_hours=MAX_RUNTIME_HOURS))
+
+    engine = AsyncRosterEngine(SHIFT_URLS)
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        log.info("👋 Manual stop requested")
+    finally:
+        engine.show_statistics()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
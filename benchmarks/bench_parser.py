@@ -0,0 +1,167 @@
+"""Microbenchmark: shift_parser against the original per-function regex code.
+
+Run from the repository root:
+
+    python benchmarks/bench_parser.py [--texts 5000] [--repeat 5]
+
+Checks that both implementations produce identical IDs, info strings and
+shift detection before timing them.
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shift_parser
+
+
+# ================= ORIGINAL IMPLEMENTATION =================
+# Verbatim copies of the RenderShiftAutoClaimer methods before shift_parser
+def legacy_generate_shift_id(text):
+    date_match = re.search(r'\b(mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\s+\d{1,2}\s+\w{3}', text.lower())
+    time_match = re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\s*-\s*\d{1,2}:\d{2}\s*(am|pm)', text.lower())
+
+    if date_match and time_match:
+        return f"{date_match.group()}_{time_match.group()}".replace(" ", "_")
+    else:
+        return hashlib.md5(text[:100].encode()).hexdigest()[:12]
+
+
+def legacy_is_shift_text(text):
+    text_lower = text.lower()
+
+    days = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
+            'monday', 'tuesday', 'wednesday', 'thursday',
+            'friday', 'saturday', 'sunday']
+
+    has_day = any(f' {day} ' in f' {text_lower} ' for day in days)
+
+    has_time = bool(re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\b', text_lower, re.IGNORECASE))
+    has_est = ' est' in text_lower or ' EST' in text_lower
+    has_shift = 'shift' in text_lower or 'glo' in text_lower.lower()
+
+    return (has_day and has_time) or (has_day and has_est) or (has_day and has_shift)
+
+
+def legacy_extract_shift_info(text):
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+    shift_lines = []
+    for line in lines:
+        has_day = bool(re.search(r'\b(mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', line, re.IGNORECASE))
+        has_time = bool(re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\b', line, re.IGNORECASE))
+
+        if has_day and has_time:
+            clean_line = re.sub(r'\s+', ' ', line)
+            shift_lines.append(clean_line)
+
+    if shift_lines:
+        return " | ".join(shift_lines[:2])
+
+    for line in lines:
+        if len(line) > 10 and any(word in line.lower() for word in ['am', 'pm', 'est']):
+            return line[:80]
+
+    return text[:60]
+
+
+# ================= FIXTURES =================
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+LOCATIONS = ["GLO Downtown", "GLO Airport", "Warehouse", "Front Desk"]
+NOISE = [
+    "Roster confirmation for the current period",
+    "Please review your upcoming shifts below",
+    "Contact your manager with any questions about this roster",
+]
+
+
+def make_texts(count, seed=7):
+    """Mix of shift rows (several layouts), wrapper text and unrelated text"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        day, month = rng.choice(DAYS), rng.choice(MONTHS)
+        start = rng.randint(1, 12)
+        end = rng.randint(1, 12)
+        row = (f"{day} {rng.randint(1, 28)} {month}\n"
+               f"{start}:{rng.choice(['00', '30'])} {rng.choice(['am', 'pm'])} - "
+               f"{end}:{rng.choice(['00', '30'])} {rng.choice(['am', 'pm'])} EST\n"
+               f"{rng.choice(LOCATIONS)}")
+        kind = rng.random()
+        if kind < 0.5:
+            texts.append(row + "\nClaim")
+        elif kind < 0.7:
+            texts.append(f"Open shift {row.replace(chr(10), '  ')} Accepted")
+        elif kind < 0.85:
+            texts.append(rng.choice(NOISE) + "\n" + row)
+        else:
+            texts.append(rng.choice(NOISE) + " " + rng.choice(NOISE))
+    return texts
+
+
+# ================= BENCHMARK =================
+def legacy_pipeline(texts):
+    results = []
+    for text in texts:
+        if legacy_is_shift_text(text):
+            # collect_new_shifts called extract_shift_info twice per new element
+            legacy_extract_shift_info(text)
+            results.append((legacy_generate_shift_id(text), legacy_extract_shift_info(text)))
+    return results
+
+
+def parser_pipeline(texts):
+    return [(shift.id, shift.info) for shift in shift_parser.parse_shifts(texts)]
+
+
+def best_time(func, texts, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(texts)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def check_equivalence(texts):
+    for text in texts:
+        assert shift_parser.is_shift_text(text) == legacy_is_shift_text(text), text
+        assert shift_parser.shift_id(text) == legacy_generate_shift_id(text), text
+        assert shift_parser.shift_info(text) == legacy_extract_shift_info(text), text
+    assert parser_pipeline(texts) == legacy_pipeline(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    check_equivalence(texts)
+    print(f"✅ Outputs identical for {len(texts)} texts")
+
+    rows = [
+        ("is_shift_text", lambda t: [legacy_is_shift_text(x) for x in t],
+         lambda t: [shift_parser.is_shift_text(x) for x in t]),
+        ("generate_shift_id", lambda t: [legacy_generate_shift_id(x) for x in t], shift_parser.shift_ids),
+        ("extract_shift_info", lambda t: [legacy_extract_shift_info(x) for x in t],
+         lambda t: [shift_parser.shift_info(x) for x in t]),
+        ("full pipeline", legacy_pipeline, parser_pipeline),
+    ]
+
+    print(f"\n{'stage':<20}{'legacy':>12}{'parser':>12}{'speedup':>10}")
+    for name, legacy, fast in rows:
+        legacy_time = best_time(legacy, texts, args.repeat)
+        fast_time = best_time(fast, texts, args.repeat)
+        print(f"{name:<20}{legacy_time * 1000:>10.1f}ms{fast_time * 1000:>10.1f}ms{legacy_time / fast_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
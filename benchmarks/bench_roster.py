@@ -0,0 +1,376 @@
+"""Roster-scale benchmark for the scan and claim hot path.
+
+Serves synthetic roster pages (benchmarks/roster_fixtures.py) from a local
+HTTP server to headless Chromium and drives RenderShiftAutoClaimer against
+them. For each roster size it records:
+
+  scan_ms          collect_new_shifts on a freshly loaded page, scanning every
+                   candidate (median)
+  learned_scan_ms  the same scan through a learned shift-row selector (median;
+                   None when no selector could be learned)
+  parse_per_sec    shift_parser.parse_shifts throughput on the extracted texts
+  round_trips      Playwright API calls made by one scan
+  claim_ms         time from scan start until the server receives the claim POST
+  claim_round_trips  Playwright API calls made by that scan-and-claim
+  batch_click_ms   detect-to-click of each shift in one concurrent batch
+                   (CLAIM_CONCURRENCY shifts, claim pages loaded beforehand)
+  last_click_ms    detect-to-click of the batch's last shift (shift N)
+  peak_rss_mb      peak RSS of this process plus its children (Chromium)
+
+Everything runs offline. Results are written as JSON so runs can be
+compared:
+
+    python benchmarks/bench_roster.py --sizes 10 100 1000 5000 --output bench.json
+    python benchmarks/bench_roster.py --compare bench.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+
+import render_shift_claimer
+import shift_parser
+from roster_fixtures import generate_roster_html
+from row_selector import LearnedRowSelector
+from shift_store import roster_key
+
+# Lower-is-better metrics checked by --compare (parse_per_sec is higher-is-better)
+COMPARED_METRICS = ("scan_ms", "learned_scan_ms", "round_trips", "claim_ms", "claim_round_trips", "last_click_ms", "peak_rss_mb")
+
+
+# ================= LOCAL ROSTER SERVER =================
+class RosterServer:
+    """Serves /roster?shifts=N pages and records when /claim POSTs arrive"""
+
+    def __init__(self):
+        self.pages = {}
+        self.claims = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                count = int(query.get("shifts", ["10"])[0])
+                if count not in server.pages:
+                    server.pages[count] = generate_roster_html(count).encode()
+                self._send(200, "text/html; charset=utf-8", server.pages[count])
+
+            def do_POST(self):
+                received = time.perf_counter()
+                length = int(self.headers.get("Content-Length", 0))
+                server.claims.append((received, self.rfile.read(length).decode()))
+                self._send(200, "application/json", b'{"ok": true}')
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, shift_count):
+        return f"http://127.0.0.1:{self.httpd.server_port}/roster?shifts={shift_count}"
+
+
+# ================= ROUND-TRIP COUNTING =================
+class RoundTripCounter:
+    """Counts Playwright API calls made through a wrapped page and its handles"""
+
+    WRAPPED_TYPES = ("Page", "ElementHandle", "JSHandle", "Locator", "Frame")
+
+    def __init__(self):
+        self.count = 0
+
+    def wrap(self, value):
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if type(value).__name__ in self.WRAPPED_TYPES:
+            return _CountingProxy(value, self)
+        return value
+
+
+class _CountingProxy:
+    def __init__(self, target, counter):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_counter", counter)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._counter.count += 1
+            return self._counter.wrap(attr(*args, **kwargs))
+        return call
+
+    def __bool__(self):
+        return True
+
+
+# ================= MEMORY SAMPLING =================
+class ProcessTreeSampler:
+    """Samples the summed RSS of this process and all descendants (Linux /proc)"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.running = False
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def __enter__(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+
+    def reset(self):
+        self.peak = self.sample()
+
+    def _run(self):
+        while self.running:
+            self.peak = max(self.peak, self.sample())
+            time.sleep(self.interval)
+
+    def sample(self):
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # Field 4 is the parent PID; the command name may contain spaces
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+
+        total = 0
+        stack = [os.getpid()]
+        while stack:
+            pid = stack.pop()
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * self.page_size
+            except (OSError, IndexError, ValueError):
+                pass
+            stack.extend(children.get(pid, []))
+        return total
+
+
+# ================= BENCHMARK =================
+def make_claimer(page, url, counter, row_selector=None):
+    """A claimer on page; without a row_selector it scans every candidate and writes no selector cache"""
+    claimer = render_shift_claimer.RenderShiftAutoClaimer(url)
+    claimer.page = counter.wrap(page)
+    claimer.row_selector = row_selector
+    claimer.start_time = time.time()
+    return claimer
+
+
+def bench_batch_claim(page, url):
+    """Detect-to-click in ms of each shift in one concurrent claim batch, in click order"""
+    page.goto(url, wait_until="load")
+    claimer = make_claimer(page, url, RoundTripCounter())
+    if not claimer.claim_pool:
+        return []
+    # Loaded as they would be in the idle time before the scan
+    claimer.claim_pool.open()
+
+    clicks = []
+    record_detect_to_click = claimer.record_detect_to_click
+
+    def timed(shift):
+        seconds = record_detect_to_click(shift)
+        clicks.append(round(seconds * 1000, 2))
+        return seconds
+    claimer.record_detect_to_click = timed
+
+    new_shifts = claimer.collect_new_shifts()
+    claimable = [s for s in new_shifts if s['status'] == "MY CLAIM"][:claimer.claim_pool.size]
+    claimer.claim_new_shifts(claimable)
+    claimer.claim_pool.close()
+    return clicks
+
+
+def bench_size(browser, server, sampler, shift_count, repeat):
+    url = server.url(shift_count)
+    page = browser.new_page()
+    page.set_default_timeout(60000)
+    sampler.reset()
+
+    scan_times = []
+    round_trips = 0
+    texts = []
+    for _ in range(repeat):
+        page.goto(url, wait_until="load")
+        counter = RoundTripCounter()
+        claimer = make_claimer(page, url, counter)
+        scan_start = time.perf_counter()
+        claimer.collect_new_shifts()
+        scan_times.append((time.perf_counter() - scan_start) * 1000)
+        round_trips = counter.count
+
+    # A first scan learns the shift-row selector (in a throwaway cache), the repeats use it
+    learned_times = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        row_selector = LearnedRowSelector(roster_key(url),
+                                          os.path.join(cache_dir, "row_selectors.json"))
+        for index in range(repeat + 1):
+            page.goto(url, wait_until="load")
+            claimer = make_claimer(page, url, RoundTripCounter(), row_selector)
+            scan_start = time.perf_counter()
+            claimer.collect_new_shifts()
+            if index:
+                learned_times.append((time.perf_counter() - scan_start) * 1000)
+    learned_scan_ms = round(statistics.median(learned_times), 2) if row_selector.selector else None
+
+    texts = [record['text'] for record in page.evaluate(render_shift_claimer.EXTRACT_SHIFTS_JS, {
+        'selector': render_shift_claimer.SHIFT_CANDIDATE_SELECTOR,
+        'minLength': 20
+    })]
+
+    parse_start = time.perf_counter()
+    parse_rounds = max(1, 20000 // max(len(texts), 1))
+    for _ in range(parse_rounds):
+        shift_parser.parse_shifts(texts)
+    parse_elapsed = time.perf_counter() - parse_start
+    parse_per_sec = len(texts) * parse_rounds / parse_elapsed if texts else 0
+
+    # Time-to-claim: fresh load, then scan and claim the first claimable shift
+    page.goto(url, wait_until="load")
+    counter = RoundTripCounter()
+    claimer = make_claimer(page, url, counter)
+    claims_before = len(server.claims)
+    claim_start = time.perf_counter()
+    new_shifts = claimer.collect_new_shifts()
+    claimable = [s for s in new_shifts if s['status'] == "MY CLAIM"][:1]
+    claimer.claim_new_shifts(claimable)
+    claim_ms = None
+    deadline = time.perf_counter() + 5
+    while len(server.claims) == claims_before and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    if len(server.claims) > claims_before:
+        claim_ms = (server.claims[claims_before][0] - claim_start) * 1000
+
+    batch_clicks = bench_batch_claim(page, url)
+
+    page.close()
+    return {
+        'shifts': shift_count,
+        'candidates': len(texts),
+        'scan_ms': round(statistics.median(scan_times), 2),
+        'learned_scan_ms': learned_scan_ms,
+        'parse_per_sec': round(parse_per_sec),
+        'round_trips': round_trips,
+        'claim_ms': round(claim_ms, 2) if claim_ms is not None else None,
+        'claim_round_trips': counter.count,
+        'batch_click_ms': batch_clicks,
+        'last_click_ms': batch_clicks[-1] if batch_clicks else None,
+        'peak_rss_mb': round(sampler.peak / 2**20, 1)
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print metric changes against a baseline run; returns the regressions"""
+    regressions = []
+    baseline_by_size = {row['shifts']: row for row in baseline['results']}
+    print(f"\n{'shifts':>7} {'metric':<18}{'baseline':>12}{'current':>12}{'change':>9}")
+    for row in results:
+        base = baseline_by_size.get(row['shifts'])
+        if not base:
+            continue
+        for metric in COMPARED_METRICS + ("parse_per_sec",):
+            old, new = base.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric == "parse_per_sec" else change
+            flag = "  ❌" if worse > threshold else ""
+            if flag:
+                regressions.append((row['shifts'], metric, old, new))
+            print(f"{row['shifts']:>7} {metric:<18}{old:>12}{new:>12}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roster-scale scan/claim benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3, help="scans per size (median is reported)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before flagging")
+    parser.add_argument("--executable-path", help="Chromium binary (defaults to Playwright's)")
+    args = parser.parse_args()
+
+    results = []
+    with RosterServer() as server, ProcessTreeSampler() as sampler, sync_playwright() as playwright:
+        browser = playwright.chromium.launch(
+            headless=True,
+            executable_path=args.executable_path,
+            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+        )
+        for size in args.sizes:
+            row = bench_size(browser, server, sampler, size, args.repeat)
+            results.append(row)
+            print(f"{size:>5} shifts: scan {row['scan_ms']}ms (learned rows {row['learned_scan_ms']}ms), {row['round_trips']} round trips, "
+                  f"claim {row['claim_ms']}ms, batch clicks {row['batch_click_ms']}ms, parse {row['parse_per_sec']}/s, peak RSS {row['peak_rss_mb']}MB")
+        browser.close()
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Synthetic Deputy-style roster pages for the benchmarks.
+
+generate_roster_html builds a roster_confirm-like page with a mix of
+claimable shifts (Claim button that opens a confirmation dialog and then
+POSTs to /claim), already accepted shifts and shifts assigned to someone
+else, wrapped in the kind of nested layout and page chrome the real roster
+has so candidate filtering has realistic work to do. generate_roster_json
+returns the same shifts as Deputy-style roster objects, as the page's roster
+API would.
+"""
+import html
+import json
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+LOCATIONS = ["GLO Downtown", "GLO Airport", "GLO Warehouse", "GLO Front Desk", "GLO Kitchen"]
+COWORKERS = ["A. Rivera", "J. Chen", "M. Okafor", "S. Patel", "L. Novak"]
+STATES = ("claimable", "accepted", "not_mine")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Roster Confirmation</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; }}
+  .shift-row {{ display: flex; gap: 12px; padding: 8px; border-bottom: 1px solid #ddd; }}
+  .modal {{ position: fixed; top: 30%; left: 30%; padding: 24px; background: #fff; border: 1px solid #333; }}
+  .modal[hidden] {{ display: none; }}
+</style>
+</head>
+<body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main>
+  <div class="page-title"><p>Roster confirmation for {employee}</p></div>
+  <div id="roster" class="roster">
+{days}
+  </div>
+</main>
+<footer><p>Please contact your manager with any questions about this roster.</p></footer>
+<div class="modal" role="dialog" hidden>
+  <p>Are you sure you want to claim this shift?</p>
+  <button type="button" class="confirm">OK</button>
+  <button type="button" class="cancel">Cancel</button>
+</div>
+<script>
+{fetch_roster}  let pending = null;
+  const modal = document.querySelector('.modal');
+  document.querySelectorAll('.claim').forEach((btn) => btn.addEventListener('click', () => {{
+    pending = btn.closest('.shift-row').dataset.shiftId;
+    modal.hidden = false;
+  }}));
+  modal.querySelector('.confirm').addEventListener('click', () => {{
+    modal.hidden = true;
+    fetch('/claim', {{ method: 'POST', body: pending }});
+  }});
+  modal.querySelector('.cancel').addEventListener('click', () => {{ modal.hidden = true; }});
+</script>
+</body>
+</html>
+"""
+
+
+def fixture_states(shift_count, claimable_ratio=0.2, accepted_ratio=0.3, seed=1):
+    """Deterministic list of shift states for a roster of shift_count shifts"""
+    rng = random.Random(seed)
+    states = []
+    for _ in range(shift_count):
+        roll = rng.random()
+        if roll < claimable_ratio:
+            states.append("claimable")
+        elif roll < claimable_ratio + accepted_ratio:
+            states.append("accepted")
+        else:
+            states.append("not_mine")
+    if shift_count and "claimable" not in states:
+        states[0] = "claimable"
+    return states
+
+
+def fixture_shifts(shift_count, claimable_ratio=0.2, accepted_ratio=0.3, seed=1, start=None):
+    """Deterministic shifts as dicts (number, start, end, location, state, assignee), grouped by day"""
+    rng = random.Random(seed)
+    start = start or date.today() + timedelta(days=1)
+    states = fixture_states(shift_count, claimable_ratio, accepted_ratio, seed)
+
+    shifts_per_day = max(1, min(12, shift_count // 7 or 1))
+    days = []
+    for day_index in range(0, shift_count, shifts_per_day):
+        shift_date = start + timedelta(days=day_index // shifts_per_day)
+        days.append((shift_date, [
+            _shift(day_index + offset, shift_date, state, rng)
+            for offset, state in enumerate(states[day_index:day_index + shifts_per_day])
+        ]))
+    return days
+
+
+def generate_roster_html(shift_count, claimable_ratio=0.2, accepted_ratio=0.3, seed=1, start=None, json_url=None):
+    """Render a roster page with shift_count shifts spread over consecutive days.
+
+    With json_url the page also fetches its roster objects from there, as the
+    real roster loads its data over XHR.
+    """
+    day_blocks = []
+    for shift_date, shifts in fixture_shifts(shift_count, claimable_ratio, accepted_ratio, seed, start):
+        day_blocks.append(
+            f'    <div class="roster-day">\n'
+            f'      <div class="roster-day-header"><span>{shift_date:%A %d %B}</span></div>\n'
+            + "\n".join(_shift_row(shift) for shift in shifts) +
+            '\n    </div>'
+        )
+
+    nav = "".join(f'<li><a href="#">{item}</a></li>'
+                  for item in ("Dashboard", "Schedule", "Timesheets", "Leave", "News Feed"))
+    fetch_roster = f"  fetch({json.dumps(json_url)});\n" if json_url else ""
+    return PAGE_TEMPLATE.format(nav=nav, employee="Test Employee", days="\n".join(day_blocks),
+                                fetch_roster=fetch_roster)
+
+
+def generate_roster_json(shift_count, claimable_ratio=0.2, accepted_ratio=0.3, seed=1, start=None,
+                         utc_offset_hours=-5, localized=True):
+    """The generate_roster_html shifts as Deputy-style roster objects.
+
+    Times are in the roster's zone (UTC offset utc_offset_hours): unix
+    StartTime/EndTime, plus ISO StartTimeLocalized/EndTimeLocalized with the
+    offset when localized is True.
+    """
+    zone = timezone(timedelta(hours=utc_offset_hours))
+    objects = []
+    for _, shifts in fixture_shifts(shift_count, claimable_ratio, accepted_ratio, seed, start):
+        for shift in shifts:
+            start_time = shift['start'].replace(tzinfo=zone)
+            end_time = shift['end'].replace(tzinfo=zone)
+            roster = {
+                'Id': shift['number'] + 1000,
+                'StartTime': int(start_time.timestamp()),
+                'EndTime': int(end_time.timestamp()),
+                'OperationalUnitName': shift['location'],
+                'CanClaim': shift['state'] == "claimable",
+                'Accepted': shift['state'] == "accepted"
+            }
+            if localized:
+                roster['StartTimeLocalized'] = start_time.isoformat()
+                roster['EndTimeLocalized'] = end_time.isoformat()
+            objects.append(roster)
+    return json.dumps({'Rosters': objects})
+
+
+def _shift(number, shift_date, state, rng):
+    start_hour = rng.randint(6, 18)
+    length = rng.choice([2, 4, 6, 8])
+    start = datetime.combine(shift_date, time(start_hour, rng.choice([0, 30])))
+    end = datetime.combine(shift_date, time((start_hour + length) % 24))
+    if end <= start:
+        end += timedelta(days=1)
+    location = rng.choice(LOCATIONS)
+    assignee = rng.choice(COWORKERS) if state == "not_mine" else None
+    return {'number': number, 'start': start, 'end': end, 'location': location, 'state': state, 'assignee': assignee}
+
+
+def _shift_row(shift):
+    if shift['state'] == "claimable":
+        action = '<button type="button" class="btn claim">Claim</button>'
+    elif shift['state'] == "accepted":
+        action = '<span class="badge">Accepted</span>'
+    else:
+        action = f'<span class="assignee">Assigned to {html.escape(shift["assignee"])}</span>'
+
+    start = shift['start']
+    return (
+        f'      <div class="shift-row" data-shift-id="{shift["number"]}">\n'
+        f'        <div class="shift-when"><span>{start:%a} {start.day} {start:%b}</span> '
+        f'<span>{_clock(start.hour, start.minute)} - {_clock(shift["end"].hour, 0)} EST</span></div>\n'
+        f'        <div class="shift-where"><span>{html.escape(shift["location"])}</span></div>\n'
+        f'        <div class="shift-action">{action}</div>\n'
+        f'      </div>'
+    )
+
+
+def _clock(hour, minute):
+    return f"{hour % 12 or 12}:{minute:02d} {'am' if hour < 12 else 'pm'}"
@@ -0,0 +1,164 @@
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from claimer_log import fields, log
+
+# Marks a page whose reload has been requested; the reloaded document lacks it
+STALE_MARK_JS = "() => { window.__gleeStale = true; setTimeout(() => location.reload(), 0); }"
+
+
+# ================= CLAIM PAGE POOL =================
+class ClaimPagePool:
+    """Pre-opened pages in the roster page's browser context that claim shifts side by side.
+
+    The pool pages are reloaded in the claimer's idle time, together with the
+    roster page, so at claim time they already show the roster the scan saw.
+    The roster page claims the first shift of a batch, and each pool page
+    claims its own shift with one extraction and a click, so all claim
+    requests are in flight together. A pool page only reloads on the claim
+    path when its roster doesn't show the shift yet (push mode, or a reload
+    that hasn't finished). Every page confirms its own dialog, and each
+    claim's latency is measured from the start of the batch. With the sync
+    API this is one thread interleaving short calls; only the waits for
+    server responses overlap.
+    """
+
+    def __init__(self, claimer, size, roster_ready_js, timeouts):
+        self.claimer = claimer
+        self.size = max(1, size)
+        self.roster_ready_js = roster_ready_js
+        self.timeouts = timeouts
+        self.pages = []
+
+    def open(self):
+        """Open size - 1 extra pages on the roster, sharing the main page's session"""
+        self.pages = [page for page in self.pages if not page.is_closed()]
+        if len(self.pages) >= self.size - 1:
+            return
+        context = self.claimer.page.context
+        while len(self.pages) < self.size - 1:
+            page = context.new_page()
+            page.set_default_timeout(45000)
+            try:
+                page.goto(self.claimer.url, wait_until="domcontentloaded", timeout=45000)
+            except Exception as e:
+                log.warning(f"⚠️  Claim page failed to load: {str(e)[:80]}")
+            self.pages.append(page)
+        if self.pages:
+            log.info(f"🧵 {len(self.pages)} claim page(s) ready ({self.size} concurrent claims)")
+
+    def refresh(self):
+        """Start reloading every pool page in the background, like the roster page between scans"""
+        for page in self.pages:
+            if page.is_closed():
+                continue
+            try:
+                page.evaluate(STALE_MARK_JS)
+            except Exception as e:
+                log.debug(f"Claim page reload failed: {str(e)[:80]}")
+
+    def close(self):
+        for page in self.pages:
+            try:
+                page.close()
+            except:
+                pass
+        self.pages = []
+
+    def claim(self, shifts):
+        """Claim shifts in batches of up to size; returns the claimed shifts"""
+        if len(self.pages) < self.size - 1 or any(page.is_closed() for page in self.pages):
+            self.open()
+
+        claimed = []
+        width = len(self.pages) + 1
+        for index in range(0, len(shifts), width):
+            claimed += self.claim_batch(shifts[index:index + width])
+        return claimed
+
+    def claim_batch(self, shifts):
+        """Claim up to size shifts at once, one per page"""
+        claimer = self.claimer
+        batch_start = time.perf_counter()
+        slots = list(zip([claimer.page] + self.pages, shifts))
+
+        # Fire every claim click without waiting for its response
+        in_flight = []
+        for page, shift in slots:
+            try:
+                if page is claimer.page:
+                    claim_selector = shift.get('claim_selector') or claimer.locate_claim_selector(shift['id'])
+                else:
+                    claim_selector = self.tag_pool_page(page, shift['id'])
+                if not claim_selector:
+                    log.warning("[SKIP] No claim button found for: %s", shift['info'][:50])
+                    self.record(shift, False, batch_start)
+                    continue
+
+                log.debug("[CLAIMING] %s...", shift['info'][:60])
+                since = claimer.click_start(page)
+                claimer.record_detect_to_click(shift)
+                page.click(claim_selector, delay=30, timeout=self.timeouts['claim'], no_wait_after=True)
+                in_flight.append((page, shift, since))
+            except Exception as e:
+                log.error(f"[ERROR] Claim failed: {str(e)[:50]}")
+                self.record(shift, False, batch_start)
+
+        # Each page answers its own confirmation dialog
+        confirming = []
+        for page, shift, since in in_flight:
+            outcome = claimer.wait_for_claim_outcome('claim', since, replaced_sleep=1,
+                                                     accept_dialog=True, page=page)
+            confirm_since = claimer.handle_confirmation_dialogs(
+                dialog_open=outcome == 'dialog', page=page, wait=False)
+            confirming.append((page, shift, outcome, confirm_since))
+
+        claimed = []
+        for page, shift, outcome, confirm_since in confirming:
+            outcome = claimer.confirmed_outcome(outcome, confirm_since, page=page)
+            if self.record(shift, outcome is not None, batch_start):
+                claimed.append(shift)
+        return claimed
+
+    def tag_pool_page(self, page, shift_id):
+        """Claim selector for the shift on a pool page, reloading the page only if it doesn't show the shift"""
+        claim_selector = self.find_claim_selector(page, shift_id)
+        if claim_selector:
+            return claim_selector
+        try:
+            if not page.evaluate("() => !!window.__gleeStale"):
+                page.evaluate(STALE_MARK_JS)
+        except PlaywrightTimeoutError:
+            return None
+        except Exception:
+            pass  # Already navigating
+        try:
+            page.wait_for_function(f"() => !window.__gleeStale && ({self.roster_ready_js})()",
+                                   polling=50, timeout=self.timeouts['roster'])
+        except PlaywrightTimeoutError:
+            return None
+        return self.find_claim_selector(page, shift_id)
+
+    def find_claim_selector(self, page, shift_id):
+        """Run the extraction on a pool page and return the shift's claim selector, or None"""
+        try:
+            shifts = self.claimer.extract_dom_shifts(page)
+        except Exception:
+            # The page is between documents (a reload is in flight)
+            return None
+        for shift in shifts:
+            if shift['id'] == shift_id and shift['claim_selector']:
+                return shift['claim_selector']
+        return None
+
+    def record(self, shift, success, batch_start):
+        """Report one claim attempt and its latency"""
+        latency = time.perf_counter() - batch_start
+        self.claimer.metrics.observe('claim_latency', latency)
+        if success:
+            log.info(f"[SUCCESS] Claimed: {shift['info'][:50]} ({latency * 1000:.0f}ms)",
+                     extra=fields(event="claim", shift=shift['id'], latency_ms=round(latency * 1000)))
+        else:
+            log.warning(f"[FAILED] Not confirmed: {shift['info'][:50]} ({latency * 1000:.0f}ms)")
+        return success
@@ -0,0 +1,112 @@
+import re
+from datetime import datetime
+
+import shift_parser
+
+# ================= CONFIG =================
+DAY_WEIGHTS = {}  # Points per day, e.g. {'sat': 3, 'sun': 3, 'mon': -1}
+START_HOUR_WEIGHTS = []  # (from_hour, to_hour, points) windows on the start time, e.g. [(6, 12, 2)]
+DURATION_WEIGHT = 1.0  # Points per hour of shift length (negative prefers short shifts)
+MIN_DURATION_HOURS = None  # Skip shorter shifts, None = no limit
+MAX_DURATION_HOURS = None  # Skip longer shifts, None = no limit
+KEYWORD_WEIGHTS = {}  # Points for role/location words in the shift text, e.g. {'airport': 2, 'kitchen': -5}
+MIN_CLAIM_SCORE = None  # Skip shifts scoring below this, None = claim everything
+SKIP_OVERLAPPING_SHIFTS = True  # Don't claim shifts that overlap one already held or ranked higher
+# =========================================
+
+
+# ================= RANKER =================
+class ClaimRanker:
+    """Orders claimable shifts by preference score, best first.
+
+    Lookups are precomputed (a 24-hour table for start times and a single
+    keyword regex), so scoring a shift costs a few microseconds. Ties keep
+    roster order. Shifts we hold (claimed or accepted) are kept as time
+    intervals for the overlap check.
+    """
+
+    def __init__(self, day_weights=None, start_hour_weights=None, duration_weight=DURATION_WEIGHT,
+                 keyword_weights=None, min_score=MIN_CLAIM_SCORE, skip_overlapping=SKIP_OVERLAPPING_SHIFTS,
+                 min_hours=MIN_DURATION_HOURS, max_hours=MAX_DURATION_HOURS):
+        self.day_weights = {day[:3].lower(): points
+                            for day, points in (DAY_WEIGHTS if day_weights is None else day_weights).items()}
+        self.hour_points = [0.0] * 24
+        for from_hour, to_hour, points in (START_HOUR_WEIGHTS if start_hour_weights is None else start_hour_weights):
+            for hour in range(from_hour, to_hour):
+                self.hour_points[hour % 24] += points
+        self.duration_weight = duration_weight
+        keyword_weights = KEYWORD_WEIGHTS if keyword_weights is None else keyword_weights
+        self.keyword_weights = {word.lower(): points for word, points in keyword_weights.items()}
+        self.keyword_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(word) for word in self.keyword_weights) + r")\b"
+        ) if self.keyword_weights else None
+        self.min_score = min_score
+        self.skip_overlapping = skip_overlapping
+        self.min_hours = min_hours
+        self.max_hours = max_hours
+        self.held = []
+
+    def score(self, shift):
+        """Preference score of a parsed Shift"""
+        points = 0.0
+        if shift.day:
+            points += self.day_weights.get(shift.day, 0)
+        if shift.start:
+            points += self.hour_points[shift.start.hour]
+            if shift.end:
+                points += (shift.end - shift.start).total_seconds() / 3600 * self.duration_weight
+        if self.keyword_pattern:
+            for word in self.keyword_pattern.findall(shift.text.lower()):
+                points += self.keyword_weights[word]
+        return points
+
+    def hold(self, shift):
+        """Remember a shift we hold (a parsed Shift) for the overlap check"""
+        if shift and shift.start and shift.end:
+            self.held.append((shift.start, shift.end))
+
+    def hold_text(self, text):
+        """hold() for a shift known only by its text or ID"""
+        self.hold(shift_parser.parse_shift(text.replace("_", " ")))
+
+    def overlaps(self, shift, intervals):
+        return any(shift.start < end and start < shift.end for start, end in intervals)
+
+    def rank(self, shifts):
+        """Claimable shift dicts best first, plus (shift, reason) pairs for skipped ones"""
+        now = datetime.now()
+        self.held = [interval for interval in self.held if interval[1] > now]
+
+        scored = []
+        skipped = []
+        for position, shift in enumerate(shifts):
+            parsed = shift.get('shift')
+            if parsed is None:
+                # No parsed record (shouldn't happen); claim it in roster order
+                scored.append((0.0, position, shift))
+                continue
+            hours = parsed.duration.total_seconds() / 3600 if parsed.duration else None
+            if hours is not None and ((self.min_hours and hours < self.min_hours) or
+                                      (self.max_hours and hours > self.max_hours)):
+                skipped.append((shift, f"{hours:g}h long"))
+                continue
+            score = self.score(parsed)
+            if self.min_score is not None and score < self.min_score:
+                skipped.append((shift, f"score {score:.1f} below {self.min_score}"))
+                continue
+            shift['score'] = score
+            scored.append((-score, position, shift))
+        scored.sort(key=lambda item: (item[0], item[1]))
+
+        ranked = []
+        taken = list(self.held) if self.skip_overlapping else []
+        for _, _, shift in scored:
+            parsed = shift.get('shift')
+            if self.skip_overlapping and parsed is not None and parsed.start and parsed.end:
+                if self.overlaps(parsed, taken):
+                    skipped.append((shift, "overlaps a shift already held or ranked higher"))
+                    continue
+                taken.append((parsed.start, parsed.end))
+            ranked.append(shift)
+        return ranked, skipped
+
@@ -0,0 +1,70 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+# ================= CONFIG =================
+LOG_LEVEL = "INFO"  # "INFO" = one summary line per scan plus claims and problems, "DEBUG" = full detail
+LOG_FORMAT = "json"  # "json" = one JSON object per line, "text" = plain messages
+LOG_PATH = None  # Append the log here instead of writing to stdout
+# =========================================
+
+log = logging.getLogger("glee")
+
+
+def fields(**values):
+    """Structured fields for a log call: log.info("...", extra=fields(scan=3))"""
+    return {'fields': values}
+
+
+class JsonFormatter(logging.Formatter):
+    """{"ts", "level", "msg", **fields} on one line"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'msg': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the writer thread.
+
+    The stock handler formats each record before queueing it. Skipping that
+    makes a log call on the scan path just a record and a queue put; the
+    message is built and written by the listener thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+
+
+def setup(level=LOG_LEVEL, fmt=LOG_FORMAT, path=LOG_PATH):
+    """Send the glee logger through a queue to a background writer (once per process)"""
+    global _listener
+    if _listener:
+        return log
+
+    output = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+
+    records = queue.SimpleQueue()
+    log.addHandler(DeferredQueueHandler(records))
+    log.setLevel(level)
+    log.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(_listener.stop)
+    return log
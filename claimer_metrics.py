@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from claimer_log import log
+
+# ================= CONFIG =================
+METRICS_PORT = 9464  # Port for the /metrics endpoint, None = no endpoint
+METRICS_HOST = "127.0.0.1"  # Use "0.0.0.0" to let another machine scrape it
+METRICS_JSONL_PATH = None  # Append one JSON line per scan here, None = off
+PHASE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # seconds
+RATE_WINDOWS = (60, 300, 900)  # seconds; snapshots report per-minute rates over each window
+RATE_RESOLUTION = 5  # seconds per bucket of the sliding rate windows
+# =========================================
+
+PHASES = ("reload", "extraction", "status", "claim_click", "dialog", "restart", "scan",
+          "detect_to_click", "claim_latency", "ranking", "blind", "first_scan")
+COUNTERS = ("scans", "errors", "restarts", "claims", "claim_failures", "blocked_requests", "blocked_bytes")
+RATE_COUNTERS = ("scans", "errors", "claims", "claim_failures")
+GAUGE_LABELS = {"shifts": "status"}  # Label name for gauges published as {label: number} dicts
+
+
+# ================= HISTOGRAM =================
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets=PHASE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """(upper bound, observations at or below it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def quantile(self, q):
+        """Approximate quantile: the upper bound of the bucket holding it"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative()[:-1]:
+            if total >= rank:
+                return bound
+        return self.max
+
+
+# ================= SLIDING WINDOW =================
+class SlidingCounter:
+    """Event counts over the last span seconds, in a fixed ring of buckets.
+
+    add() touches one bucket. total() sums the buckets inside the window, so
+    its cost depends on the window, never on how many events there were.
+    """
+
+    def __init__(self, span=max(RATE_WINDOWS), resolution=RATE_RESOLUTION):
+        self.resolution = resolution
+        self.size = int(span // resolution) + 1
+        self.counts = [0] * self.size
+        self.stamps = [-1] * self.size
+
+    def add(self, amount, now):
+        bucket = int(now // self.resolution)
+        slot = bucket % self.size
+        if self.stamps[slot] != bucket:
+            self.stamps[slot] = bucket
+            self.counts[slot] = 0
+        self.counts[slot] += amount
+
+    def total(self, window, now):
+        """Events in the last window seconds (to bucket resolution)"""
+        newest = int(now // self.resolution)
+        oldest = newest - int(window // self.resolution)
+        return sum(count for stamp, count in zip(self.stamps, self.counts) if oldest < stamp <= newest)
+
+
+# ================= METRICS =================
+class ClaimerMetrics:
+    """Phase timings and counters for one claimer, served on /metrics.
+
+    Observations are also collected per scan; end_scan() writes them as one
+    JSON line when a path is configured. Counters, gauges published by the
+    claimer (shift counts per status) and sliding-window rates make up
+    snapshot(), served as JSON on /snapshot.
+    """
+
+    def __init__(self, jsonl_path=METRICS_JSONL_PATH, prefix="glee", clock=time.time):
+        self.prefix = prefix
+        self.clock = clock
+        self.started = clock()
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.rates = {name: SlidingCounter() for name in RATE_COUNTERS}
+        self.gauges = {}
+        self.scan_phases = {}
+        self.lock = threading.Lock()
+        self.jsonl = open(jsonl_path, "a", buffering=1) if jsonl_path else None
+        self.server = None
+
+    def observe(self, phase, seconds):
+        """Record one timing for a phase"""
+        with self.lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram()
+            histogram.observe(seconds)
+            self.scan_phases[phase] = self.scan_phases.get(phase, 0.0) + seconds
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+            if name in self.rates:
+                self.rates[name].add(amount, self.clock())
+
+    def set_gauges(self, **values):
+        """Publish current values (numbers, or {label: number} dicts) for snapshots and /metrics"""
+        with self.lock:
+            self.gauges.update(values)
+
+    def snapshot(self):
+        """Counters, gauges and per-minute rates; cheap enough to call from any thread at any time"""
+        now = self.clock()
+        with self.lock:
+            uptime = now - self.started
+            rates = {name: {f"{window // 60}m": counter.total(window, now) * 60 / max(min(window, uptime), 1)
+                            for window in RATE_WINDOWS}
+                     for name, counter in self.rates.items()}
+            return {
+                'uptime': uptime,
+                'counters': dict(self.counters),
+                'gauges': {name: dict(value) if isinstance(value, dict) else value
+                           for name, value in self.gauges.items()},
+                'rates': rates
+            }
+
+    @contextmanager
+    def timed(self, phase):
+        """Time the enclosed block as one observation of phase (also on errors)"""
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - phase_start)
+
+    def end_scan(self, **fields):
+        """Close the current scan: write its phase timings as a JSON line"""
+        with self.lock:
+            phases, self.scan_phases = self.scan_phases, {}
+        if not self.jsonl:
+            return
+        line = {'ts': round(time.time(), 3), **fields,
+                'phases': {phase: round(seconds, 4) for phase, seconds in phases.items()}}
+        try:
+            self.jsonl.write(json.dumps(line) + "\n")
+        except (OSError, ValueError):
+            pass
+
+    def summary(self):
+        """{phase: (count, p50, p95)} for phases with observations"""
+        with self.lock:
+            return {phase: (h.count, h.quantile(0.5), h.quantile(0.95))
+                    for phase, h in self.histograms.items() if h.count}
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        name = f"{self.prefix}_phase_seconds"
+        lines = [f"# HELP {name} Time spent in each scan/claim phase",
+                 f"# TYPE {name} histogram"]
+        with self.lock:
+            for phase, histogram in self.histograms.items():
+                for bound, total in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {total}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+            for counter, value in self.counters.items():
+                lines.append(f"# TYPE {self.prefix}_{counter}_total counter")
+                lines.append(f"{self.prefix}_{counter}_total {value}")
+            for gauge, value in self.gauges.items():
+                lines.append(f"# TYPE {self.prefix}_{gauge} gauge")
+                if isinstance(value, dict):
+                    for label, count in value.items():
+                        lines.append(f'{self.prefix}_{gauge}{{{GAUGE_LABELS.get(gauge, "key")}="{label}"}} {count}')
+                else:
+                    lines.append(f"{self.prefix}_{gauge} {value}")
+        return "\n".join(lines) + "\n"
+
+    # ================= HTTP ENDPOINT =================
+    def serve(self, port=METRICS_PORT, host=METRICS_HOST):
+        """Serve /metrics and /snapshot from a daemon thread; returns False if the port is taken"""
+        if port is None or self.server:
+            return bool(self.server)
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/metrics":
+                    body = metrics.render_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif path == "/snapshot":
+                    body = json.dumps(metrics.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            log.warning(f"⚠️  Metrics endpoint not started: {e}")
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        log.info(f"📈 Metrics on http://{host}:{self.server.server_port}/metrics")
+        return True
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.jsonl:
+            self.jsonl.close()
+            self.jsonl = None
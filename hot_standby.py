@@ -0,0 +1,140 @@
+import time
+
+from claim_pool import STALE_MARK_JS
+from claimer_log import log
+
+# ================= CONFIG =================
+STANDBY_MODE = "page"  # "page" = second tab in the same Chromium, "browser" = separate Chromium (survives crashes), None = off
+STANDBY_REFRESH_INTERVAL = 60  # seconds between background reloads of the standby page
+STANDBY_LOAD_TIMEOUT = 45  # seconds a standby load may take before the page is rebuilt
+# =========================================
+
+# Navigates a blank page to the roster without waiting; the blank document keeps the stale mark
+NAVIGATE_JS = "(url) => { window.__gleeStale = true; setTimeout(() => { location.href = url; }, 0); }"
+
+
+# ================= HOT STANDBY =================
+class HotStandby:
+    """A second roster page kept loaded so a failed page can be replaced at once.
+
+    The standby is built and reloaded in the background: maintain() only
+    starts a navigation (as PageRotation and ClaimPagePool do) and returns,
+    and the load runs on while the claimer waits between scans. A standby
+    counts as ready only once its reloaded roster has rendered. On failure,
+    take_over() swaps it in as the roster page in a few milliseconds. The
+    broken page is closed, and a fresh standby is built in the next idle
+    period.
+    """
+
+    def __init__(self, claimer, roster_ready_js, mode=STANDBY_MODE, refresh_interval=STANDBY_REFRESH_INTERVAL,
+                 load_timeout=STANDBY_LOAD_TIMEOUT):
+        self.claimer = claimer
+        self.fresh_roster_js = f"() => !window.__gleeStale && ({roster_ready_js.strip()})()"
+        self.mode = mode
+        self.refresh_interval = refresh_interval
+        self.load_timeout = load_timeout
+        self.browser = None
+        self.page = None
+        self.loaded_at = 0
+        self.load_started = None
+        self.built_at = None
+        self.failovers = 0
+
+    def ready(self):
+        """True when the standby shows a freshly loaded roster"""
+        if self.page is None or self.page.is_closed():
+            return False
+        try:
+            fresh = self.page.evaluate(self.fresh_roster_js)
+        except Exception:
+            # Between documents, or the page has crashed
+            return False
+        if fresh and self.load_started is not None:
+            self.loaded_at = time.time()
+            self.load_started = None
+            if self.built_at is not None:
+                log.info(f"🛟 Standby page ready ({(time.perf_counter() - self.built_at) * 1000:.0f}ms, "
+                         f"off the scan path)")
+                self.built_at = None
+        return fresh
+
+    def maintain(self):
+        """Build the standby if it is missing, or start reloading it if it is stale"""
+        if not self.claimer.browser:
+            return
+        if self.page is None or self.page.is_closed():
+            self.build()
+        elif self.ready():
+            if time.time() - self.loaded_at >= self.refresh_interval:
+                self.refresh()
+        elif time.time() - self.load_started >= self.load_timeout:
+            log.warning(f"⚠️  Standby page didn't load in {self.load_timeout}s, rebuilding")
+            self.discard()
+            self.build()
+
+    def build(self):
+        """Open a new standby page and start loading the roster in it"""
+        self.discard()
+        claimer = self.claimer
+        self.built_at = time.perf_counter()
+        try:
+            if self.mode == "browser":
+                self.browser = claimer.launch_chromium()
+                page = self.browser.new_page()
+            else:
+                page = claimer.browser.new_page()
+            self.page = page
+            page.set_default_timeout(45000)
+            if claimer.blocker:
+                claimer.blocker.attach(page.context)
+            self.load_started = time.time()
+            page.evaluate(NAVIGATE_JS, claimer.url)
+        except Exception as e:
+            log.warning(f"⚠️  Standby page failed to load: {str(e)[:80]}")
+            self.discard()
+
+    def refresh(self):
+        """Start reloading the standby in the background"""
+        try:
+            self.load_started = time.time()
+            self.page.evaluate(STALE_MARK_JS)
+        except Exception as e:
+            log.warning(f"⚠️  Standby refresh failed, rebuilding later: {str(e)[:80]}")
+            self.discard()
+
+    def take_over(self):
+        """Make the standby the roster page; returns False if there is none ready"""
+        if not self.ready():
+            return False
+        claimer = self.claimer
+        broken_page, broken_browser = claimer.page, claimer.browser
+
+        claimer.attach_page(self.page)
+        if self.browser:
+            claimer.browser = self.browser
+        self.page = None
+        self.browser = None
+        self.load_started = None
+        self.failovers += 1
+
+        try:
+            if broken_page:
+                broken_page.close()
+            if claimer.browser is not broken_browser and broken_browser:
+                broken_browser.close()
+        except:
+            pass
+        return True
+
+    def discard(self):
+        """Close the standby page (and its browser in "browser" mode)"""
+        try:
+            if self.page:
+                self.page.close()
+            if self.browser:
+                self.browser.close()
+        except:
+            pass
+        self.page = None
+        self.browser = None
+        self.load_started = None
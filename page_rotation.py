@@ -0,0 +1,120 @@
+import time
+from collections import deque
+
+from claim_pool import STALE_MARK_JS
+from claimer_log import log
+
+# ================= CONFIG =================
+ROSTER_PAGES = 1  # Roster pages reloaded in turn; N pages scan N times per interval ("browser" mode)
+# =========================================
+
+# Page load cost in ms from the navigation timing entry, once the reloaded roster is ready
+FRESH_ROSTER_JS = """
+() => {
+    if (window.__gleeStale || !(%s)()) return false;
+    const nav = performance.getEntriesByType('navigation')[0];
+    return Math.max(1, nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd) : 1);
+}
+"""
+
+
+# ================= PAGE ROTATION =================
+class PageRotation:
+    """Several pages on the same roster that take turns being scanned.
+
+    While one page is scanned and waits out its slot (interval / N), the next
+    page is already reloading. A page is therefore ready by its turn, and
+    reload time drops out of the detection loop. Each page still reloads only
+    once per N slots, which is no more often than a single page would. Every
+    snapshot goes through the claimer's single seen-shift index, so a shift is
+    reported once, by whichever page sees it first.
+    """
+
+    def __init__(self, claimer, count, roster_ready_js, timeouts):
+        self.claimer = claimer
+        self.count = max(1, count)
+        self.fresh_roster_js = FRESH_ROSTER_JS % roster_ready_js.strip()
+        self.timeouts = timeouts
+        self.pages = []
+        self.index = 0
+        self.reload_started = None
+        self.load_totals = [[0, 0.0] for _ in range(self.count)]  # [reloads, seconds] per page
+        self.scan_times = deque(maxlen=50)
+
+    def open(self):
+        """Use the claimer's page as page 1 and load the others"""
+        self.pages = [self.claimer.page]
+        for number in range(2, self.count + 1):
+            self.pages.append(self.new_page())
+            log.info(f"📑 Roster page {number}/{self.count} loaded")
+        self.index = 0
+
+    def new_page(self):
+        claimer = self.claimer
+        page = claimer.browser.new_page()
+        page.set_default_timeout(45000)
+        if claimer.network_source:
+            claimer.network_source.attach(page)
+        if claimer.blocker:
+            claimer.blocker.attach(page.context)
+        page.goto(claimer.url, wait_until="load", timeout=45000)
+        return page
+
+    def slot(self, interval):
+        """Seconds between scans so that each page reloads once per interval"""
+        return interval / self.count
+
+    def next_number(self):
+        return (self.index + 1) % self.count + 1
+
+    def reload_next(self):
+        """Start reloading the page whose turn is next, without waiting for it"""
+        claimer = self.claimer
+        if len(self.pages) < self.count:
+            self.open()
+        self.scan_times.append(time.time())
+        # The current page may have been replaced by a failover or restart
+        self.pages[self.index] = claimer.page
+        next_index = (self.index + 1) % self.count
+        page = self.pages[next_index]
+        if page.is_closed() or not claimer.owns(page):
+            # Lost with a restart or failover: a fresh page is loaded already
+            self.pages[next_index] = self.new_page()
+            self.reload_started = None
+            return
+
+        if claimer.network_source:
+            claimer.network_source.reset()
+        self.reload_started = claimer.start_reload()
+        page.evaluate(STALE_MARK_JS)
+
+    def advance(self):
+        """Switch the claimer to the next page once its reload has finished"""
+        claimer = self.claimer
+        self.index = (self.index + 1) % self.count
+        page = self.pages[self.index]
+        claimer.page = page
+
+        handle = page.wait_for_function(self.fresh_roster_js, polling=100, timeout=self.timeouts['roster'])
+        if self.reload_started is None:
+            return
+        load_ms = handle.json_value()
+        totals = self.load_totals[self.index]
+        totals[0] += 1
+        totals[1] += load_ms / 1000
+        claimer.metrics.observe('reload', load_ms / 1000)
+        claimer.report_blocking(self.reload_started, reload_ms=load_ms)
+
+    def effective_interval(self):
+        """Mean seconds between scans across all pages, or None before two scans"""
+        if len(self.scan_times) < 2:
+            return None
+        return (self.scan_times[-1] - self.scan_times[0]) / (len(self.scan_times) - 1)
+
+    def report(self):
+        """One line with the effective interval and each page's mean load time"""
+        loads = ", ".join(f"page {number} {seconds / reloads:.2f}s"
+                          for number, (reloads, seconds) in enumerate(self.load_totals, 1) if reloads)
+        effective = self.effective_interval()
+        interval = f"{effective:.1f}s" if effective else "n/a"
+        return f"effective interval {interval}, mean load {loads or 'n/a'}"
@@ -1,49 +1,461 @@
 import time
-import re
 import os
 import sys
+import json
+import logging
+from contextlib import contextmanager, nullcontext
+from functools import partial
 from datetime import datetime
 from playwright.sync_api import sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from roster_network import NetworkShiftSource
+from roster_http import RosterHttpPoller
+from scan_scheduler import AdaptiveScanScheduler
+from shift_store import STATE_DB_PATH, ShiftStore, roster_key
+from shift_index import SeenShiftIndex
+from claimer_metrics import METRICS_PORT, ClaimerMetrics
+from claim_pool import ClaimPagePool
+from claim_ranking import ClaimRanker
+from resource_blocking import ResourceBlocker
+from hot_standby import STANDBY_MODE, HotStandby
+from page_rotation import ROSTER_PAGES, PageRotation
+from scan_fingerprint import FULL_SCAN_EVERY, ScanFingerprint
+from browser_profile import PROFILE_DIR, BrowserProfile
+from startup_profiler import StartupProfiler
+import claimer_log
+from claimer_log import fields, log
+from row_selector import LEARN_ROW_SELECTOR_JS, ROW_SELECTOR_CACHE_PATH, LearnedRowSelector
+import shift_parser
 
 # ================= CONFIG =================
 SHIFT_URL = "https://933bba13123200.na.deputy.com/exec/hr/roster_confirm?p=eyJFbXBsb3llZUlkIjo0MjY0LCJGcm9tIjoxNzY1Nzc0ODAwLCJUbyI6MTc2NjM3OTU5OSwiY2hlY2tzdW0iOiI3NWVmNTUxZTMwMDdjOTc0MWFmNTVhYzEyMjA2ODYwNjI1ODZmYWFmIn0="
 SCAN_INTERVAL = 30  # seconds between scans (adjust as needed)
+ADAPTIVE_SCHEDULING = True  # Learn when shifts get posted and adapt the interval around SCAN_INTERVAL
 MAX_RUNTIME_HOURS = 12  # Auto-stop after X hours (prevents infinite runs)
+PERSIST_STATE = True  # Keep seen/claimed shifts in STATE_DB_PATH across restarts
+BLOCK_RESOURCES = True  # Abort images, fonts and trackers the scan doesn't need (see resource_blocking.py)
+CLAIM_CONCURRENCY = 3  # Shifts claimed at once from pre-opened pages (1 = one at a time)
+SHIFT_CANDIDATE_SELECTOR = "div, span, td, li, p"  # Elements that may hold shift text
+SHIFT_SOURCE = "dom"  # "dom" scrapes the page, "network" reads the roster JSON (DOM is the fallback)
+NETWORK_CAPTURE_MODE = "response"  # "response" listens passively, "route" intercepts requests
+CROSS_CHECK_SOURCES = False  # Log differences between network and DOM shifts each scan
+SCAN_MODE = "browser"  # "browser" reloads each scan, "push" reacts to DOM changes, "http" polls without a browser
+HTTP_POLL_URL = SHIFT_URL  # Roster page or the JSON endpoint it loads (used by "http" mode)
+HTTP_POLL_INTERVAL = 10  # seconds between HTTP polls
+ROSTER_CONTAINER_SELECTOR = "body"  # Element watched for shift changes in "push" mode
+PUSH_SAFETY_RELOAD = 300  # seconds between background reloads in "push" mode
+PUSH_WAIT_MS = 100  # how often pushed changes are picked up
+ROSTER_READY_SELECTOR = None  # CSS selector of the roster container, None = wait for shift text or network quiet
+WAIT_TIMEOUTS = {  # milliseconds; each wait ends as soon as its condition is met
+    'roster': 15000,  # roster content to appear after a load
+    'claim': 5000,  # claim request to complete (or a confirmation dialog to open)
+    'dialog': 500,  # a confirmation dialog to open after the claim response
+    'confirm': 5000  # confirmation request to complete
+}
+DIALOG_SELECTORS = [
+    "div[role='dialog']",
+    ".modal",
+    ".popup",
+    ".dialog",
+    ".confirmation"
+]
+# =========================================
+
+# ================= IN-PAGE EXTRACTION =================
+# Runs inside Chromium so a whole scan costs a single page.evaluate round trip.
+# Mirrors is_shift_text and the claim-button check: candidates are filtered on the
+# day/time heuristics, claim buttons are checked for visibility, and each
+# claimable shift's claim control is tagged with data-glee-claim, so claiming
+# is a single click on a known element. Claim buttons win over links and
+# "claim" over "accept", as in the old selector list.
+EXTRACT_SHIFTS_JS = """
+({ selector, minLength }) => {
+    const DAY_RE = /(?:^| )(?:mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday)(?= |$)/;
+    const TIME_RE = /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\b/;
+    const RANGE_RE = /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\s*-\\s*\\d{1,2}:\\d{2}\\s*(?:am|pm)/g;
+    const CLAIM_RE = /claim|accept/;
+
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 &&
+            getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    // Tags from an earlier scan of this document would point at stale keys
+    for (const el of document.querySelectorAll('[data-glee-claim]')) {
+        el.removeAttribute('data-glee-claim');
+    }
+
+    const records = [];
+    const seenTexts = new Set();
+    let key = 0;
+
+    for (const el of document.querySelectorAll(selector)) {
+        const text = (el.innerText || '').trim();
+        if (text.length < minLength || seenTexts.has(text)) continue;
+
+        const lower = text.toLowerCase();
+        if (!DAY_RE.test(lower)) continue;
+        if (!(TIME_RE.test(lower) || lower.includes(' est') ||
+              lower.includes('shift') || lower.includes('glo'))) continue;
+        // A day or roster block holding several shifts would share an ID with its
+        // first shift and carry another row's claim button
+        if ((lower.match(RANGE_RE) || []).length > 1) continue;
+        seenTexts.add(text);
+
+        let control = null;
+        let controlRank = 4;
+        for (const btn of el.querySelectorAll('button, a')) {
+            const label = (btn.textContent || '').toLowerCase();
+            const match = label.match(CLAIM_RE);
+            if (!match) continue;
+            const rank = (btn.tagName === 'A' ? 2 : 0) + (match[0] === 'accept' ? 1 : 0);
+            if (rank < controlRank && isVisible(btn)) {
+                control = btn;
+                controlRank = rank;
+                if (rank === 0) break;
+            }
+        }
+
+        key += 1;
+        const claimable = control !== null;
+        if (claimable) {
+            // Nested candidates can share a control, so keys are a space-separated list
+            const keys = control.getAttribute('data-glee-claim');
+            control.setAttribute('data-glee-claim', keys ? `${keys} ${key}` : String(key));
+        }
+        records.push({ key, text, claimable, accepted: lower.includes('accepted') });
+    }
+    return records;
+}
+"""
+
+# Extraction through the learned shift-row selector (see row_selector.py).
+# The learned selector is used while the rows it matches hold every shift
+# time range on the page; otherwise the scan falls back to the candidate
+# selector and, with learn, learns a new row selector from the result.
+# Counting the page's time ranges reads the whole page's text; pageText
+# passes it in when the caller has read it already (the fingerprinted scan).
+EXTRACT_ROWS_JS = """
+({ selector, rowSelector, minLength, learn, pageText }) => {
+    const extract = __EXTRACT__;
+    if (rowSelector) {
+        const RANGE_RE = /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\s*-\\s*\\d{1,2}:\\d{2}\\s*(?:am|pm)/g;
+        const ranges = (text) => (text.toLowerCase().match(RANGE_RE) || []).length;
+        let records = null;
+        try {
+            records = extract({ selector: rowSelector, minLength });
+        } catch (e) {}  // no longer a valid selector
+        if (records && records.reduce((sum, record) => sum + ranges(record.text), 0) >=
+                ranges(pageText ?? (document.body.innerText || ''))) {
+            return { records, rowSelector, fallback: false, learned: false };
+        }
+    }
+    const records = extract({ selector, minLength });
+    const learned = Boolean(learn);
+    return { records, rowSelector: learned ? (__LEARN__)(selector) : null, fallback: Boolean(rowSelector), learned };
+}
+""".replace("__EXTRACT__", EXTRACT_SHIFTS_JS.strip()).replace("__LEARN__", LEARN_ROW_SELECTOR_JS.strip())
+
+# The row extraction, preceded by an FNV-1a hash of the roster text and of each
+# button/link's state. When the hash equals `previous` the roster hasn't
+# changed since the last scan and the extraction is skipped (scan: null).
+FINGERPRINTED_EXTRACT_JS = """
+({ container, previous, ...scan }) => {
+    const root = document.querySelector(container) || document.body;
+    let hash = 0x811c9dc5;
+    const add = (str) => {
+        for (let i = 0; i < str.length; i++) {
+            hash ^= str.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+    };
+    const text = root.innerText || '';
+    add(text);
+    for (const el of root.querySelectorAll('button, a, [role="button"]')) {
+        add('|' + el.tagName + (el.disabled ? ':disabled' : '') +
+            (el.getAttribute('aria-disabled') || '') + (el.getAttribute('class') || ''));
+    }
+    const fingerprint = (hash >>> 0).toString(16);
+    if (fingerprint === previous) return { fingerprint, scan: null };
+    // The learned-row check counts the page's shift times; reuse the text read above
+    return { fingerprint, scan: (__EXTRACT__)({ ...scan, pageText: root === document.body ? text : undefined }) };
+}
+""".replace("__EXTRACT__", EXTRACT_ROWS_JS.strip())
+# =========================================
+
+# ================= WAIT CONDITIONS =================
+# Both conditions read resource timing, whose buffer stops at 250 entries by
+# default. ROSTER_READY_JS enlarges it on its first check of a document so a
+# busy load keeps counting requests, and CLICK_START_JS empties it right before
+# each claim or confirm click so the click's request is always recorded.
+RESOURCE_BUFFER_SIZE = 2000
+
+# Roster is ready once shift-like text is rendered, or when the page has loaded
+# and no new requests have started for 500ms (an empty roster).
+ROSTER_READY_JS = """
+() => {
+    if (!window.__gleeTimingBuffer) {
+        window.__gleeTimingBuffer = true;
+        performance.setResourceTimingBufferSize(__BUFFER_SIZE__);
+    }
+    const body = document.body;
+    if (body && /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\b/i.test(body.innerText)) return true;
+    if (document.readyState !== 'complete') return false;
+    const count = performance.getEntriesByType('resource').length;
+    const now = performance.now();
+    if (window.__gleeResourceCount !== count) {
+        window.__gleeResourceCount = count;
+        window.__gleeQuietSince = now;
+        return false;
+    }
+    return now - window.__gleeQuietSince >= 500;
+}
+""".replace("__BUFFER_SIZE__", str(RESOURCE_BUFFER_SIZE))
+
+# Page time of a click, taken just before it; CLAIM_OUTCOME_JS looks for requests started since
+CLICK_START_JS = "() => { performance.clearResourceTimings(); return performance.now(); }"
+
+# Resolves to "dialog" when a confirmation dialog is visible, or "response"
+# once an XHR/fetch request started by the click has completed.
+CLAIM_OUTCOME_JS = """
+({ dialogSelector, since, acceptDialog }) => {
+    if (acceptDialog) {
+        for (const el of document.querySelectorAll(dialogSelector)) {
+            const rect = el.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0 &&
+                getComputedStyle(el).visibility !== 'hidden') return 'dialog';
+        }
+    }
+    for (const entry of performance.getEntriesByType('resource')) {
+        if ((entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest') &&
+            entry.startTime >= since && entry.responseEnd > 0) return 'response';
+    }
+    return false;
+}
+"""
+# =========================================
+
+# ================= PUSH DETECTION =================
+# Installed as an init script so it survives reloads. Added or changed nodes
+# that look like shift content (a time, or a Claim/Accept control) are batched
+# for 25ms and reported to Python through the __gleeShiftsChanged binding.
+PUSH_OBSERVER_JS = """
+(() => {
+    if (window.__gleeObserverInstalled) return;
+    window.__gleeObserverInstalled = true;
+
+    const SHIFT_HINT = /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\b|claim|accept/i;
+    let pending = 0;
+    let timer = null;
+
+    const relevant = (node) => {
+        const text = node.nodeType === Node.TEXT_NODE ? node.data : node.textContent;
+        return !!text && text.length < 5000 && SHIFT_HINT.test(text);
+    };
+
+    const report = () => {
+        timer = null;
+        const count = pending;
+        pending = 0;
+        if (window.__gleeShiftsChanged) window.__gleeShiftsChanged(count, Date.now());
+    };
+
+    const observe = () => {
+        const container = document.querySelector(__CONTAINER__) || document.body;
+        if (!container) return false;
+        new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                if (mutation.type === 'childList') {
+                    for (const node of mutation.addedNodes) {
+                        if (relevant(node)) pending += 1;
+                    }
+                } else if (relevant(mutation.target)) {
+                    pending += 1;
+                }
+            }
+            if (pending && !timer) timer = setTimeout(report, 25);
+        }).observe(container, {
+            childList: true,
+            subtree: true,
+            characterData: true,
+            attributes: true,
+            attributeFilter: ['class', 'disabled', 'hidden', 'style']
+        });
+        return true;
+    };
+
+    if (!observe()) document.addEventListener('DOMContentLoaded', observe, { once: true });
+})()
+"""
 # =========================================
 
 # ================= SHIFT SCANNER & CLAIMER =================
 class RenderShiftAutoClaimer:
     def __init__(self, url):
         self.url = url
+        claimer_log.setup()
         self.playwright = None
         self.browser = None
         self.page = None
-        self.seen_shifts = {}
+        self.seen_shifts = SeenShiftIndex()
         self.claimed_shifts = set()
         self.start_time = None
         self.scan_count = 0
+        self.roster = roster_key(url)
+        self.store = None
+        self.warm_started = False
+        self.pending_seen = []
+        self.pending_claims = []
+        self.network_source = None
+        self.observed_page = None
+        self.mutation_count = 0
+        self.mutation_reported_at = 0
+        self.cycle_waits = {}
+        self.metrics = ClaimerMetrics()
+        self.ranker = ClaimRanker()
+        self.blocker = ResourceBlocker(url) if BLOCK_RESOURCES else None
+        self.standby = HotStandby(self, ROSTER_READY_JS) if STANDBY_MODE and SCAN_MODE != "http" else None
+        self.fingerprint = ScanFingerprint() if FULL_SCAN_EVERY else None
+        self.row_selector = LearnedRowSelector(self.roster) if ROW_SELECTOR_CACHE_PATH else None
+        self.profile = BrowserProfile(os.path.join(PROFILE_DIR, self.roster)) if PROFILE_DIR else None
+        self.startup = None
+        self.rotation = PageRotation(self, ROSTER_PAGES, ROSTER_READY_JS, WAIT_TIMEOUTS) \
+            if ROSTER_PAGES > 1 and SCAN_MODE == "browser" else None
+        self.claim_pool = ClaimPagePool(self, CLAIM_CONCURRENCY, ROSTER_READY_JS, WAIT_TIMEOUTS) \
+            if CLAIM_CONCURRENCY > 1 else None
+        self.scheduler = AdaptiveScanScheduler(SCAN_INTERVAL) if ADAPTIVE_SCHEDULING else None
+        if SHIFT_SOURCE == "network":
+            self.network_source = NetworkShiftSource(mode=NETWORK_CAPTURE_MODE)
         
     def start(self):
         """Start the auto-claimer optimized for Render"""
-        print("\n" + "="*60)
-        print("🚀 RENDER HOSTED SHIFT AUTO-CLAIMER")
-        print("="*60)
-        print(f"URL: {self.url}")
-        print(f"Scan Interval: {SCAN_INTERVAL} seconds")
-        print(f"Max Runtime: {MAX_RUNTIME_HOURS} hours")
-        print(f"Running on: {os.getenv('RENDER', 'Local Machine')}")
-        print("\n🔄 Starting continuous scanning...\n")
+        running_on = os.getenv('RENDER', 'Local Machine')
+        log.info(f"🚀 Auto-claimer starting: every {SCAN_INTERVAL}s for up to {MAX_RUNTIME_HOURS}h "
+                 f"on {running_on} ({SCAN_MODE} mode)",
+                 extra=fields(event="start", url=self.url, scan_interval=SCAN_INTERVAL,
+                              max_runtime_hours=MAX_RUNTIME_HOURS, running_on=running_on, scan_mode=SCAN_MODE))
         
         # Check if we're running in Render
         is_render = os.getenv('RENDER') is not None
         if is_render:
-            print("🌐 Running in Render environment")
-            print("📝 Note: Browser will run in headless mode")
+            log.debug("🌐 Running in Render environment (headless browser)")
         
         self.start_time = time.time()
-        self.playwright = sync_playwright().start()
         
-        # Configure for Render (headless) vs Local (visible)
+        if SCAN_MODE == "http":
+            self.prepare_state()
+            # Chromium is only launched once a claimable shift shows up
+            self.http_poll_loop()
+            return
+        
+        # State and the metrics endpoint don't need the browser: load them while Chromium starts
+        self.start_profiler(self.start_time)
+        loader = self.startup.background('state', self.prepare_state)
+        self.launch_browser()
+        
+        try:
+            log.debug("🌐 Loading page (may take up to 45 seconds)...")
+            load_start = self.start_reload()
+            with self.metrics.timed('reload'):
+                self.open_roster()
+            self.report_blocking(load_start)
+            log.info("✅ Roster visible, starting scans")
+            
+        except Exception as e:
+            log.error(f"❌ Failed to load page, restarting: {e}")
+            self.restart_browser()
+        
+        # Claim pages and extra roster pages open after the first scan (see idle)
+        self.startup.join(loader)
+        
+        if SCAN_MODE == "push":
+            self.push_scan_loop()
+        else:
+            # Continuous scanning loop
+            self.continuous_scan()
+    
+    def prepare_state(self):
+        """Everything before the first scan that doesn't need the browser"""
+        self.metrics.serve(METRICS_PORT)
+        self.load_state()
+    
+    def load_state(self):
+        """Warm start: load seen and claimed shifts saved by previous runs"""
+        if not PERSIST_STATE:
+            return
+        
+        load_start = time.time()
+        # May run on a startup thread; the main thread takes the store over afterwards
+        self.store = ShiftStore(STATE_DB_PATH, check_same_thread=False)
+        rows, self.claimed_shifts = self.store.load(self.roster)
+        
+        posted_times = []
+        retries = 0
+        for shift_id, status, info, first_seen, last_seen, posted in rows:
+            if posted:
+                posted_times.append(first_seen)
+            if status == "MY CLAIM" and shift_id not in self.claimed_shifts:
+                # Never claimed (the claim failed or the process stopped first):
+                # left unseen so the first scan tries it again if it's still there
+                retries += 1
+                continue
+            self.seen_shifts.add(shift_id, status, info, first_seen=first_seen, last_seen=last_seen)
+            if status == "ALREADY CLAIMED" or shift_id in self.claimed_shifts:
+                # IDs carry the date and time range; info may not
+                self.ranker.hold_text(shift_id)
+        
+        if rows:
+            self.warm_started = True
+            if self.scheduler:
+                self.scheduler.observe(posted_times)
+                # Shifts on the page now were already known, so the first scan is a
+                # normal one, unless it will report the claims being retried
+                self.scheduler.primed = not retries
+        
+        log.info(f"💾 Loaded {len(rows)} seen / {len(self.claimed_shifts)} claimed shifts "
+                 f"in {(time.time() - load_start) * 1000:.0f}ms"
+                 + (f", retrying {retries} unclaimed" if retries else ""))
+    
+    def expire_past_shifts(self):
+        """Forget shifts whose date has passed (checked once per day)"""
+        expired = self.seen_shifts.expire()
+        if expired:
+            log.info(f"🧹 Forgot {len(expired)} past shift(s)")
+            if self.store:
+                self.store.forget(self.roster, expired)
+    
+    def flush_state(self):
+        """Save this scan's new shifts and claims in one batch"""
+        if not self.store:
+            return
+        try:
+            self.store.write_batch(self.roster, self.pending_seen, self.pending_claims)
+            self.pending_seen = []
+            self.pending_claims = []
+        except Exception as e:
+            log.warning(f"⚠️  Failed to save shift state: {str(e)[:100]}")
+    
+    def launch_browser(self):
+        """Launch Chromium on the persistent profile and open the roster page tab"""
+        self.browser = self.launch_chromium(self.profile)
+        # A persistent context opens with a blank tab already
+        page = self.browser.pages[0] if self.profile and self.browser.pages else self.browser.new_page()
+        page.set_default_timeout(45000)  # 45 second timeout for slow pages
+        self.attach_page(page)
+    
+    def launch_chromium(self, profile=None):
+        """Launch a Chromium configured for Render (headless) or local runs (visible)
+        
+        With a profile this returns the profile's persistent context, which
+        stands in for the browser (new_page, close).
+        """
+        is_render = os.getenv('RENDER') is not None
+        if not self.playwright:
+            with self.startup_phase('driver'):
+                self.playwright = sync_playwright().start()
+        launch = partial(profile.launch, self.playwright.chromium) if profile else self.playwright.chromium.launch
+        
         browser_args = [
             "--disable-blink-features=AutomationControlled",
             "--no-sandbox",
@@ -51,101 +463,340 @@ class RenderShiftAutoClaimer:
             "--disable-gpu"
         ]
         
-        if is_render:
-            # On Render, we need headless mode
-            self.browser = self.playwright.chromium.launch(
-                headless=True,
-                args=browser_args
-            )
-            print("✅ Headless browser launched")
+        with self.startup_phase('launch'):
+            if is_render:
+                # On Render, we need headless mode
+                browser = launch(
+                    headless=True,
+                    args=browser_args
+                )
+                log.info("✅ Headless browser launched")
+            else:
+                # Local development - visible browser
+                browser = launch(
+                    headless=False,
+                    args=browser_args
+                )
+                log.info("✅ Visible browser launched")
+        return browser
+    
+    def attach_page(self, page):
+        """Make page the roster page and hook up network capture and request blocking"""
+        self.page = page
+        if self.network_source:
+            self.network_source.reset()
+            self.network_source.attach(page)
+        if self.blocker:
+            self.blocker.attach(page.context)
+    
+    def owns(self, page):
+        """True if page belongs to the current browser (or its persistent context)"""
+        return self.browser is not None and self.browser in (page.context, page.context.browser)
+    
+    def open_roster(self):
+        """Navigate to the roster and return as soon as it has rendered, not at the load event"""
+        with self.startup_phase('navigate'):
+            self.page.goto(self.url, wait_until="commit", timeout=45000)
+        with self.startup_phase('roster'):
+            self.wait_for_roster(replaced_sleep=5)
+    
+    def start_profiler(self, started=None):
+        """Profile the way to the next first scan, from now or from started (a time.time())"""
+        kind = "warm" if self.profile and self.profile.is_warm() else "cold"
+        self.startup = StartupProfiler(kind, started)
+    
+    def startup_phase(self, name):
+        return self.startup.phase(name) if self.startup else nullcontext()
+    
+    def finish_profiler(self):
+        """Report time to first scan by phase once the first scan after a launch has finished"""
+        if not self.startup:
+            return
+        startup, self.startup = self.startup, None
+        seconds = startup.finish()
+        self.metrics.observe('first_scan', seconds)
+        if self.profile:
+            self.profile.record_startup(startup.kind, seconds)
+            median = f"; median {self.profile.report()}"
         else:
-            # Local development - visible browser
-            self.browser = self.playwright.chromium.launch(
-                headless=False,
-                args=browser_args
-            )
-            print("✅ Visible browser launched")
-        
-        self.page = self.browser.new_page()
-        self.page.set_default_timeout(45000)  # 45 second timeout for slow pages
-        
-        try:
-            print("🌐 Loading page (may take up to 45 seconds)...")
-            self.page.goto(self.url, wait_until="load", timeout=45000)
-            time.sleep(5)  # Extra time for JavaScript to load
-            print("✅ Page loaded successfully")
-            
-            # Continuous scanning loop
-            self.continuous_scan()
-            
-        except Exception as e:
-            print(f"❌ Failed to load page: {e}")
-            print("🔄 Attempting to restart...")
-            self.restart_browser()
-            self.continuous_scan()
+            median = ""
+        log.info(f"🏁 Time to first scan: {seconds:.2f}s ({startup.kind} profile{median})\n{startup.report()}",
+                 extra=fields(event="first_scan", seconds=round(seconds, 3), kind=startup.kind,
+                              phases={name: round(phase_seconds, 3) for name, phase_seconds in startup.phases}))
     
     def continuous_scan(self):
         """Main scanning loop with Render optimizations"""
         while True:
             # Check if we've exceeded maximum runtime
             if self.check_max_runtime():
-                print(f"\n⏰ Maximum runtime ({MAX_RUNTIME_HOURS} hours) reached")
-                print("🛑 Stopping to prevent infinite runs")
+                log.info(f"⏰ Maximum runtime ({MAX_RUNTIME_HOURS} hours) reached, stopping")
                 break
             
-            self.scan_count += 1
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"\n{'='*60}")
-            print(f"🔍 SCAN #{self.scan_count} - {current_time}")
-            print('='*60)
-            
             try:
-                scan_start = time.time()
-                
-                # Collect new shifts
-                new_shifts = self.collect_new_shifts()
+                # Blind time is counted from the start of whichever step fails
+                operation_start = time.perf_counter()
+                new_shifts = self.run_scan()
                 
-                if new_shifts:
-                    print(f"\n📊 Found {len(new_shifts)} NEW shifts")
-                    self.display_new_shifts(new_shifts)
-                    
-                    # Try to claim available new shifts
-                    shifts_claimed = self.claim_new_shifts(new_shifts)
-                    
-                    if shifts_claimed > 0:
-                        print(f"✅ Claimed {shifts_claimed} new shift(s)")
+                # Wait before next scan (shorter while shifts are being posted)
+                if self.scheduler:
+                    self.scheduler.record_scan(len(new_shifts))
+                    decision = self.scheduler.next_interval()
+                    wait_time = decision.interval
+                    detail = f" ({decision.mode} mode, posting lift {decision.lift:.2f})"
                 else:
-                    print("\n📭 No new shifts found")
+                    wait_time = SCAN_INTERVAL
+                    detail = ""
+                if self.rotation:
+                    # The next page reloads while this slot is waited out
+                    wait_time = self.rotation.slot(wait_time)
+                    detail += f" on roster page {self.rotation.next_number()}/{self.rotation.count}"
+                    self.rotation.reload_next()
+                log.debug(f"⏳ Next scan in {wait_time:.0f} seconds{detail}...")
+                operation_start = time.perf_counter()
+                self.idle(wait_time)
                 
-                scan_time = time.time() - scan_start
-                print(f"\n⏱️  Scan completed in {scan_time:.2f}s")
-                
-                # Show overall statistics
-                self.show_statistics()
-                
-                # Wait before next scan (shorter if we claimed shifts)
-                wait_time = SCAN_INTERVAL
-                print(f"\n⏳ Next scan in {wait_time} seconds...")
-                time.sleep(wait_time)
+                operation_start = time.perf_counter()
+                if self.rotation:
+                    self.rotation.advance()
+                else:
+                    # Refresh page for next scan
+                    log.debug("🔄 Refreshing page...")
+                    self.refresh_page()
                 
-                # Refresh page for next scan
-                print("\n🔄 Refreshing page...")
+            except KeyboardInterrupt:
+                log.info("👋 Keyboard interrupt detected")
+                break
+            except Exception as e:
+                self.metrics.increment('errors')
+                log.error(f"[ERROR] Scan error: {str(e)[:100]}")
+                self.recover(operation_start)
+    
+    def idle(self, seconds):
+        """Wait between scans, using the time to keep the claim and standby pages loaded.
+
+        The wait goes through Playwright rather than time.sleep: route handlers
+        (resource blocking, the network source) only run while a Playwright call
+        is in progress, so a page reloading in the background would otherwise
+        stall on its first request until the next scan.
+        """
+        deadline = time.time() + seconds
+        if self.claim_pool:
+            # Claim pages reload alongside the roster page, so a claim needs no reload
+            self.claim_pool.refresh()
+            self.claim_pool.open()
+        if self.standby:
+            self.standby.maintain()
+        remaining = deadline - time.time()
+        if remaining > 0:
+            self.page.wait_for_timeout(remaining * 1000)
+    
+    def recover(self, failed_since=None):
+        """Get a working roster page back: the standby at once, else reload, else restart.
+
+        failed_since is when the step that failed started (perf_counter); the
+        roster was unwatched from then, not just while recovering.
+        """
+        blind_start = failed_since or time.perf_counter()
+        if self.standby and self.standby.take_over():
+            log.warning("⚡ Switched to the standby page (rebuilding a new standby while idle)")
+            if SCAN_MODE == "push":
+                self.install_push_observer()
+        else:
+            log.warning("🔄 Attempting recovery...")
+            try:
                 self.refresh_page()
+            except:
+                log.error("[ERROR] Failed to recover, restarting browser...")
+                self.restart_browser()
+        blind_time = time.perf_counter() - blind_start
+        self.metrics.observe('blind', blind_time)
+        log.info(f"👁️  Blind for {blind_time * 1000:.0f}ms during recovery",
+                 extra=fields(event="recovery", blind_ms=round(blind_time * 1000)))
+    
+    def run_scan(self):
+        """Collect, display and claim new shifts on the current page"""
+        self.scan_count += 1
+        self.metrics.increment('scans')
+        detail = log.isEnabledFor(logging.DEBUG)
+        if detail:
+            log.debug(f"🔍 SCAN #{self.scan_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        scan_start = time.time()
+        self.expire_past_shifts()
+        
+        # Collect new shifts
+        new_shifts = self.collect_new_shifts()
+        
+        if new_shifts:
+            # Claim first: the shift list is logged once the clicks are done
+            shifts_claimed = self.claim_new_shifts(new_shifts)
+            if detail:
+                self.display_new_shifts(new_shifts)
+        else:
+            shifts_claimed = 0
+        
+        self.flush_state()
+        self.publish_statistics()
+        
+        scan_time = time.time() - scan_start
+        self.metrics.observe('scan', scan_time)
+        self.metrics.end_scan(scan=self.scan_count, new=len(new_shifts), claimed=shifts_claimed)
+        log.info(f"🔍 Scan #{self.scan_count}: {len(new_shifts)} new, {shifts_claimed} claimed in {scan_time:.2f}s",
+                 extra=fields(event="scan", scan=self.scan_count, new=len(new_shifts),
+                              claimed=shifts_claimed, seconds=round(scan_time, 3)))
+        self.finish_profiler()
+        
+        if detail:
+            self.show_wait_budget()
+            # Show overall statistics
+            self.show_statistics()
+        else:
+            self.cycle_waits = {}
+        return new_shifts
+    
+    def push_scan_loop(self):
+        """Scan as soon as the roster DOM changes, with a slow reload as a safety net"""
+        self.install_push_observer()
+        log.info(f"👀 Watching roster for changes (safety reload every {PUSH_SAFETY_RELOAD}s)")
+        
+        self.run_scan()
+        last_reload = time.time()
+        if self.claim_pool:
+            self.claim_pool.open()
+        
+        while True:
+            if self.check_max_runtime(quiet=True):
+                log.info(f"⏰ Maximum runtime ({MAX_RUNTIME_HOURS} hours) reached, stopping")
+                break
+            
+            try:
+                # Bindings are delivered while Playwright is waiting
+                operation_start = time.perf_counter()
+                self.page.wait_for_timeout(PUSH_WAIT_MS)
                 
+                if self.mutation_count:
+                    latency_ms = time.time() * 1000 - self.mutation_reported_at
+                    log.debug(f"⚡ {self.mutation_count} roster change(s) pushed "
+                              f"({latency_ms:.0f}ms after the DOM changed)")
+                    self.mutation_count = 0
+                    self.run_scan()
+                elif time.time() - last_reload >= PUSH_SAFETY_RELOAD:
+                    log.debug("🔄 Safety reload...")
+                    self.refresh_page()
+                    last_reload = time.time()
+                    self.mutation_count = 0
+                    self.run_scan()
+                    if self.claim_pool:
+                        self.claim_pool.refresh()
+                    if self.standby:
+                        self.standby.maintain()
+                    
             except KeyboardInterrupt:
-                print("\n\n👋 Keyboard interrupt detected")
+                log.info("👋 Keyboard interrupt detected")
                 break
             except Exception as e:
-                print(f"[ERROR] Scan error: {str(e)[:100]}")
-                print("🔄 Attempting recovery...")
+                self.metrics.increment('errors')
+                log.error(f"[ERROR] Scan error: {str(e)[:100]}")
+                self.recover(operation_start)
+                last_reload = time.time()
+    
+    def install_push_observer(self):
+        """Expose the change binding and install the observer on this and future loads"""
+        if self.observed_page is self.page:
+            return
+        script = PUSH_OBSERVER_JS.replace("__CONTAINER__", json.dumps(ROSTER_CONTAINER_SELECTOR))
+        self.mutation_count = 0
+        self.observed_page = self.page
+        self.page.expose_binding("__gleeShiftsChanged", self.on_roster_mutation)
+        self.page.add_init_script(script)
+        self.page.evaluate(script)
+    
+    def on_roster_mutation(self, source, count, reported_at):
+        """Binding called from the page when shift nodes are added or changed"""
+        if not self.mutation_count:
+            self.mutation_reported_at = reported_at
+        self.mutation_count += count
+    
+    def http_poll_loop(self):
+        """Poll the roster over HTTP and only start Chromium to click claims"""
+        poller = RosterHttpPoller(HTTP_POLL_URL, self.generate_shift_id, self.is_shift_text)
+        log.info(f"📡 HTTP polling every {HTTP_POLL_INTERVAL}s (browser starts on demand)")
+        
+        try:
+            while True:
+                if self.check_max_runtime():
+                    log.info(f"⏰ Maximum runtime ({MAX_RUNTIME_HOURS} hours) reached, stopping")
+                    break
+                
+                self.scan_count += 1
+                self.metrics.increment('scans')
                 try:
-                    self.refresh_page()
-                    time.sleep(5)
-                except:
-                    print("[ERROR] Failed to recover, restarting browser...")
-                    self.restart_browser()
+                    poll_start = time.time()
+                    self.expire_past_shifts()
+                    with self.metrics.timed('extraction'):
+                        changed, shifts = poller.poll()
+                    new_shifts = []
+                    if changed:
+                        with self.metrics.timed('status'):
+                            new_shifts = self.filter_new_shifts(shifts)
+                    poll_time = time.time() - poll_start
+                    self.metrics.observe('scan', poll_time)
+                    self.flush_state()
+                    self.publish_statistics()
+                    
+                    if new_shifts:
+                        shifts_claimed = 0
+                        if any(s['status'] == "MY CLAIM" for s in new_shifts):
+                            shifts_claimed = self.claim_with_browser(new_shifts)
+                            self.flush_state()
+                            self.publish_statistics()
+                        log.info(f"📊 Poll #{self.scan_count}: {len(new_shifts)} new, {shifts_claimed} claimed "
+                                 f"({poll_time:.2f}s)",
+                                 extra=fields(event="scan", scan=self.scan_count, new=len(new_shifts),
+                                              claimed=shifts_claimed, seconds=round(poll_time, 3)))
+                        
+                        if log.isEnabledFor(logging.DEBUG):
+                            self.display_new_shifts(new_shifts)
+                            self.show_statistics()
+                    elif self.scan_count % 30 == 0:
+                        log.info(f"📭 Poll #{self.scan_count}: no changes "
+                                 f"({poller.not_modified} not-modified, "
+                                 f"{poller.pool.reused}/{poller.pool.requests} reused connections)")
+                    self.metrics.end_scan(scan=self.scan_count, new=len(new_shifts))
+                    
+                    time.sleep(HTTP_POLL_INTERVAL)
+                    
+                except KeyboardInterrupt:
+                    log.info("👋 Keyboard interrupt detected")
+                    break
+                except Exception as e:
+                    self.metrics.increment('errors')
+                    log.error(f"[ERROR] Poll error: {str(e)[:100]}")
+                    poller.close()
+                    time.sleep(HTTP_POLL_INTERVAL)
+        finally:
+            poller.close()
+    
+    def claim_with_browser(self, shifts):
+        """Open the roster in Chromium just long enough to claim shifts"""
+        try:
+            log.info("🌐 Claimable shift found, starting browser...")
+            self.launch_browser()
+            load_start = self.start_reload()
+            with self.metrics.timed('reload'):
+                self.open_roster()
+            self.report_blocking(load_start)
+            return self.claim_new_shifts(shifts)
+        finally:
+            try:
+                if self.browser:
+                    self.browser.close()
+            except:
+                pass
+            self.browser = None
+            self.page = None
     
-    def check_max_runtime(self):
+    def check_max_runtime(self, quiet=False):
         """Check if we've exceeded maximum runtime"""
         current_runtime = time.time() - self.start_time
         max_seconds = MAX_RUNTIME_HOURS * 3600
@@ -154,71 +805,114 @@ class RenderShiftAutoClaimer:
             return True
         
         # Show runtime warning when approaching limit
-        if current_runtime > (max_seconds * 0.9):  # 90% of max
+        if not quiet and current_runtime > (max_seconds * 0.9):  # 90% of max
             remaining = (max_seconds - current_runtime) / 60
-            print(f"⚠️  Warning: {remaining:.1f} minutes remaining before auto-stop")
+            log.warning(f"⚠️  Warning: {remaining:.1f} minutes remaining before auto-stop")
         
         return False
     
     def refresh_page(self):
         """Refresh the page with error handling"""
-        try:
-            self.page.reload(wait_until="domcontentloaded", timeout=20000)
-            time.sleep(3)  # Wait for content to load
-        except:
+        if self.network_source:
+            self.network_source.reset()
+        reload_start = self.start_reload()
+        with self.metrics.timed('reload'):
             try:
-                self.page.reload(wait_until="load", timeout=30000)
-                time.sleep(4)
-            except Exception as e:
-                print(f"⚠️  Refresh failed: {e}")
-                raise
+                self.page.reload(wait_until="domcontentloaded", timeout=20000)
+                self.wait_for_roster(replaced_sleep=3)
+            except:
+                if self.standby and self.standby.ready():
+                    # Failing over now beats waiting out a second, longer reload
+                    raise
+                try:
+                    self.page.reload(wait_until="load", timeout=30000)
+                    self.wait_for_roster(replaced_sleep=4)
+                except Exception as e:
+                    log.warning(f"⚠️  Refresh failed: {e}")
+                    raise
+        self.report_blocking(reload_start)
+    
+    def start_reload(self):
+        """Reset the blocker's per-reload tally; returns the reload start time"""
+        if self.blocker:
+            self.blocker.start_reload()
+        return time.perf_counter()
+    
+    def report_blocking(self, reload_start, reload_ms=None):
+        """Report what the request blocker saved on the reload that just finished"""
+        if not self.blocker:
+            return
+        if reload_ms is None:
+            reload_ms = (time.perf_counter() - reload_start) * 1000
+        saved = self.blocker.finish_reload(reload_ms)
+        if saved:
+            blocked, saved_bytes, saved_ms = saved
+            self.metrics.increment('blocked_requests', blocked)
+            self.metrics.increment('blocked_bytes', saved_bytes)
+            log.debug(f"🚫 Blocked {blocked} request(s): ~{saved_bytes / 1024:.0f} KB, ~{saved_ms:.0f}ms saved")
     
     def collect_new_shifts(self):
         """Collect only shifts we haven't seen before"""
+        collect_start = time.perf_counter()
+        fingerprint = None
+        with self.metrics.timed('extraction'):
+            if self.network_source and self.network_source.has_data:
+                candidates = self.network_source.shifts()
+                if CROSS_CHECK_SOURCES:
+                    self.cross_check_sources()
+            elif self.fingerprint:
+                fingerprint, candidates = self.extract_changed_dom_shifts()
+            else:
+                candidates = self.extract_dom_shifts()
+        
+        if candidates is None:
+            # Same roster as the last scan, so nothing on it can be new
+            self.fingerprint.record(fingerprint, time.perf_counter() - collect_start, changed=False)
+            log.debug("🟰 Roster unchanged since the last scan (extraction skipped)")
+            return []
+        
+        with self.metrics.timed('status'):
+            new_shifts = self.filter_new_shifts(candidates)
+        if fingerprint:
+            self.fingerprint.record(fingerprint, time.perf_counter() - collect_start, changed=True)
+        return new_shifts
+    
+    def filter_new_shifts(self, candidates):
+        """Record unseen candidates and return them without duplicates"""
         new_shifts = []
         
-        # Get all text elements that might contain shift info
-        all_elements = self.page.query_selector_all("div, span, td, li, p")
+        # Shifts on the very first scan of a fresh store were not just posted
+        posted = int(self.warm_started or self.scan_count > 1)
+        detected_at = time.perf_counter()
         
-        for element in all_elements:
-            try:
-                element_text = element.inner_text().strip()
-                if not element_text or len(element_text) < 20:
-                    continue
-                    
-                # Check if this looks like a shift
-                if self.is_shift_text(element_text):
-                    # Create a unique ID for this shift
-                    shift_id = self.generate_shift_id(element_text)
-                    
-                    # Skip if we've already seen this shift
-                    if shift_id in self.seen_shifts:
-                        continue
-                    
-                    # Get shift status
-                    status = self.get_shift_status(element)
-                    
-                    # Store in seen shifts
-                    self.seen_shifts[shift_id] = {
-                        'status': status,
-                        'first_seen': datetime.now().strftime("%H:%M:%S"),
-                        'last_seen': datetime.now().strftime("%H:%M:%S"),
-                        'info': self.extract_shift_info(element_text)
-                    }
-                    
-                    # Clean and extract shift info
-                    shift_info = self.extract_shift_info(element_text)
-                    
-                    if shift_info:
-                        new_shifts.append({
-                            'id': shift_id,
-                            'info': shift_info,
-                            'status': status,
-                            'element': element
-                        })
-                        
-            except:
+        for shift in candidates:
+            # Skip if we've already seen this shift
+            if self.seen_shifts.seen(shift['id']):
+                continue
+            
+            parsed = shift_parser.parse_shift(shift['text'])
+            shift_day = parsed.date.toordinal() if parsed.date else 0
+            if self.seen_shifts.is_past(shift_day):
+                # Expired from the index but still on the roster page
                 continue
+            shift_info = shift.get('info') or parsed.info
+            now = time.time()
+            self.pending_seen.append((shift['id'], shift['status'], shift_info, now, now, posted))
+            
+            # Store in seen shifts
+            self.seen_shifts.add(shift['id'], shift['status'], shift_info, first_seen=now, shift_day=shift_day)
+            if shift['status'] == "ALREADY CLAIMED":
+                self.ranker.hold(parsed)
+            
+            if shift_info:
+                new_shifts.append({
+                    'id': shift['id'],
+                    'info': shift_info,
+                    'status': shift['status'],
+                    'claim_selector': shift.get('claim_selector'),
+                    'detected_at': detected_at,
+                    'shift': parsed
+                })
         
         # Remove duplicates based on shift info
         unique_shifts = []
@@ -231,99 +925,88 @@ class RenderShiftAutoClaimer:
         
         return unique_shifts
     
-    def generate_shift_id(self, text):
+    def extract_dom_shifts(self, page=None):
+        """Scrape shift candidates from the rendered page"""
+        # One round trip: the browser filters candidates and detects claim buttons
+        # Only the roster page's own scans learn row selectors (claim pages just use them)
+        scan = page is None or page is self.page
+        result = (page or self.page).evaluate(EXTRACT_ROWS_JS, self.extraction_args(learn=scan))
+        if scan and self.row_selector:
+            self.row_selector.update(result)
+        return self.dom_shifts_from_records(result['records'])
+    
+    def extraction_args(self, learn=True):
+        """Arguments for the in-page extraction"""
+        args = {'selector': SHIFT_CANDIDATE_SELECTOR, 'rowSelector': None, 'minLength': 20, 'learn': False}
+        if self.row_selector:
+            args.update(self.row_selector.scan_args(learn))
+        return args
+    
+    def dom_shifts_from_records(self, records):
+        """Shift candidates from the in-page extraction records"""
+        return [{
+            'id': self.generate_shift_id(record['text']),
+            'text': record['text'],
+            'status': self.status_from_record(record),
+            'claim_selector': f'[data-glee-claim~="{record["key"]}"]' if record['claimable'] else None
+        } for record in records]
+    
+    def extract_changed_dom_shifts(self):
+        """extract_dom_shifts unless the roster fingerprint is unchanged: (fingerprint, shifts or None)"""
+        result = self.page.evaluate(FINGERPRINTED_EXTRACT_JS, {
+            **self.extraction_args(),
+            'container': ROSTER_CONTAINER_SELECTOR,
+            'previous': self.fingerprint.expected()
+        })
+        if result['scan'] is None:
+            return result['fingerprint'], None
+        if self.row_selector:
+            self.row_selector.update(result['scan'])
+        return result['fingerprint'], self.dom_shifts_from_records(result['scan']['records'])
+    
+    def locate_claim_selector(self, shift_id):
+        """Find the claim control for a shift reported by the network source"""
+        for shift in self.extract_dom_shifts():
+            if shift['id'] == shift_id and shift['claim_selector']:
+                return shift['claim_selector']
+        return None
+    
+    def cross_check_sources(self):
+        """Report differences between the network and DOM shift sources"""
+        report = self.network_source.cross_check(self.extract_dom_shifts())
+        if any(report.values()):
+            log.warning(f"⚠️  Source mismatch: {len(report['missing_in_network'])} missing in network, "
+                        f"{len(report['missing_in_dom'])} missing in DOM, "
+                        f"{len(report['status_mismatch'])} status differences")
+    
+    @staticmethod
+    def generate_shift_id(text):
         """Generate a unique ID for a shift based on its content"""
-        # Extract key parts for the ID
-        date_match = re.search(r'\b(mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\s+\d{1,2}\s+\w{3}', text.lower())
-        time_match = re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\s*-\s*\d{1,2}:\d{2}\s*(am|pm)', text.lower())
-        
-        if date_match and time_match:
-            return f"{date_match.group()}_{time_match.group()}".replace(" ", "_")
-        else:
-            # Fallback: hash of first 100 chars
-            import hashlib
-            return hashlib.md5(text[:100].encode()).hexdigest()[:12]
+        return shift_parser.shift_id(text)
     
-    def is_shift_text(self, text):
+    @staticmethod
+    def is_shift_text(text):
         """Check if text contains shift information"""
-        text_lower = text.lower()
-        
-        # Check for day patterns
-        days = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun',
-                'monday', 'tuesday', 'wednesday', 'thursday', 
-                'friday', 'saturday', 'sunday']
-        
-        has_day = any(f' {day} ' in f' {text_lower} ' for day in days)
-        
-        # Check for time patterns
-        has_time = bool(re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\b', text_lower, re.IGNORECASE))
-        has_est = ' est' in text_lower or ' EST' in text_lower
-        has_shift = 'shift' in text_lower or 'glo' in text_lower.lower()
-        
-        return (has_day and has_time) or (has_day and has_est) or (has_day and has_shift)
+        return shift_parser.is_shift_text(text)
     
-    def extract_shift_info(self, text):
+    @staticmethod
+    def extract_shift_info(text):
         """Extract clean shift information"""
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        shift_lines = []
-        for line in lines:
-            has_day = bool(re.search(r'\b(mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', line, re.IGNORECASE))
-            has_time = bool(re.search(r'\b\d{1,2}:\d{2}\s*(am|pm)\b', line, re.IGNORECASE))
-            
-            if has_day and has_time:
-                clean_line = re.sub(r'\s+', ' ', line)
-                shift_lines.append(clean_line)
-        
-        if shift_lines:
-            return " | ".join(shift_lines[:2])
-        
-        for line in lines:
-            if len(line) > 10 and any(word in line.lower() for word in ['am', 'pm', 'est']):
-                return line[:80]
-        
-        return text[:60]
+        return shift_parser.shift_info(text)
     
-    def get_shift_status(self, element):
-        """Determine shift status based on buttons and text"""
-        try:
-            element_text = element.inner_text().lower()
-            
-            # Check for claim buttons
-            has_claim_button = False
-            claim_selectors = [
-                "button:has-text('Claim')",
-                "button:has-text('CLAIM')",
-                "button:has-text('Accept')",
-                "button:has-text('ACCEPT')",
-                "a:has-text('Claim')",
-                "a:has-text('Accept')"
-            ]
-            
-            for selector in claim_selectors:
-                try:
-                    btn = element.query_selector(selector)
-                    if btn and btn.is_visible():
-                        has_claim_button = True
-                        break
-                except:
-                    continue
-            
-            has_accepted = 'accepted' in element_text
-            
-            if has_claim_button:
-                return "MY CLAIM"
-            elif has_accepted:
-                return "ALREADY CLAIMED"
-            else:
-                return "NOT MY CLAIM"
-                
-        except:
-            return "UNKNOWN"
+    @staticmethod
+    def status_from_record(record):
+        """Determine shift status from the in-page extraction record"""
+        if record['claimable']:
+            return "MY CLAIM"
+        elif record['accepted']:
+            return "ALREADY CLAIMED"
+        else:
+            return "NOT MY CLAIM"
     
     def display_new_shifts(self, shifts):
-        """Display newly found shifts with their status"""
-        print("-" * 100)
+        """Log newly found shifts grouped by status (debug detail)"""
+        lines = [f"📊 Found {len(shifts)} NEW shifts"]
         
         status_groups = {}
         for shift in shifts:
@@ -342,201 +1025,362 @@ class RenderShiftAutoClaimer:
                          "✅" if status == "ALREADY CLAIMED" else \
                          "❌" if status == "NOT MY CLAIM" else "❓"
                 
-                print(f"\n{symbol} {status} ({len(shifts_in_group)} new):")
-                print("-" * 40)
+                lines.append(f"{symbol} {status} ({len(shifts_in_group)} new):")
                 
                 for i, shift in enumerate(shifts_in_group, 1):
-                    print(f"{i:2d}. {shift['info']}")
+                    lines.append(f"{i:2d}. {shift['info']}")
         
-        print("\n" + "-" * 100)
+        log.debug("\n".join(lines), extra=fields(event="new_shifts", shifts=[
+            {'id': shift['id'], 'status': shift['status'], 'info': shift['info']} for shift in shifts
+        ]))
     
     def claim_new_shifts(self, shifts):
         """Claim new shifts that are available"""
         shifts_claimed = 0
         
-        claimable_shifts = [s for s in shifts if s['status'] == "MY CLAIM"]
+        claimable_shifts = [s for s in shifts
+                            if s['status'] == "MY CLAIM" and s['id'] not in self.claimed_shifts]
         
         if not claimable_shifts:
             return 0
         
-        print(f"\n🎯 ATTEMPTING TO CLAIM {len(claimable_shifts)} NEW SHIFT(S)...")
+        # Best shift first: the first click is the one most likely to win
+        with self.metrics.timed('ranking'):
+            claimable_shifts, skipped = self.ranker.rank(claimable_shifts)
+        for shift, reason in skipped:
+            log.info("[SKIP] %s (%s)", shift['info'][:50], reason)
+        if not claimable_shifts:
+            return 0
+        
+        log.debug("🎯 Attempting to claim %d new shift(s)", len(claimable_shifts))
+        
+        if self.claim_pool and len(claimable_shifts) > 1:
+            # All claims in flight at once, each confirmed on its own page
+            try:
+                claimed = self.claim_pool.claim(claimable_shifts)
+            except Exception as e:
+                log.error(f"[ERROR] Concurrent claim failed: {str(e)[:50]}")
+                claimed = []
+            for shift in claimed:
+                self.record_claim(shift)
+            self.metrics.increment('claim_failures', len(claimable_shifts) - len(claimed))
+            return len(claimed)
         
+        claim_start = time.perf_counter()
         for shift in claimable_shifts:
             try:
                 claimed = self.claim_single_shift(shift)
+                self.metrics.observe('claim_latency', time.perf_counter() - claim_start)
                 if claimed:
                     shifts_claimed += 1
-                    self.claimed_shifts.add(shift['id'])
-                    time.sleep(1)  # Slightly longer pause for stability
+                    self.record_claim(shift)
+                    # No pause between claims: each claim waits for its own response
+                    self.record_wait('between_claims', 0, 1)
+                else:
+                    self.metrics.increment('claim_failures')
             except Exception as e:
-                print(f"[ERROR] Failed to claim shift: {str(e)[:50]}")
+                self.metrics.increment('claim_failures')
+                log.error(f"[ERROR] Failed to claim shift: {str(e)[:50]}")
                 continue
         
         return shifts_claimed
     
+    def record_claim(self, shift):
+        """Remember a claimed shift so it is never clicked again"""
+        self.metrics.increment('claims')
+        self.claimed_shifts.add(shift['id'])
+        self.seen_shifts.set_status(shift['id'], "ALREADY CLAIMED")
+        self.ranker.hold(shift.get('shift'))
+        now = time.time()
+        self.pending_claims.append((shift['id'], now))
+        # The stored row keeps its first_seen and posted flag and takes the new status
+        self.pending_seen.append((shift['id'], "ALREADY CLAIMED", shift['info'], now, now, 0))
+    
     def claim_single_shift(self, shift):
-        """Claim a single shift"""
+        """Claim a single shift with one click on the control captured by the scan"""
         try:
-            element = shift['element']
+            claim_selector = shift.get('claim_selector') or self.locate_claim_selector(shift['id'])
+            if not claim_selector:
+                log.warning("[SKIP] No claim button found for: %s", shift['info'][:50])
+                return False
             
-            claim_button = None
-            claim_selectors = [
-                "button:has-text('Claim')",
-                "button:has-text('CLAIM')",
-                "button:has-text('Accept')",
-                "button:has-text('ACCEPT')",
-                "a:has-text('Claim')",
-                "a:has-text('Accept')"
-            ]
+            log.debug("[CLAIMING] %s...", shift['info'][:60])
             
-            for selector in claim_selectors:
-                try:
-                    btn = element.query_selector(selector)
-                    if btn and btn.is_visible():
-                        claim_button = btn
-                        break
-                except:
-                    continue
+            with self.metrics.timed('claim_click'):
+                since = self.click_start()
+                detect_to_click = self.record_detect_to_click(shift)
+                # Playwright waits for the tagged control to be actionable; a
+                # timeout means the shift has left the page since the scan
+                self.page.click(claim_selector, delay=30, timeout=WAIT_TIMEOUTS['claim'])
+                outcome = self.wait_for_claim_outcome('claim', since, replaced_sleep=1, accept_dialog=True)
             
-            if not claim_button:
-                parent = element.query_selector("..")
-                for _ in range(3):
-                    if parent:
-                        for selector in claim_selectors:
-                            try:
-                                btn = parent.query_selector(selector)
-                                if btn and btn.is_visible():
-                                    claim_button = btn
-                                    break
-                            except:
-                                continue
-                        if claim_button:
-                            break
-                        parent = parent.query_selector("..")
+            with self.metrics.timed('dialog'):
+                confirm_since = self.handle_confirmation_dialogs(dialog_open=outcome == 'dialog', wait=False)
+                outcome = self.confirmed_outcome(outcome, confirm_since)
             
-            if claim_button:
-                print(f"[CLAIMING] {shift['info'][:60]}...")
-                
-                claim_button.click(delay=30)
-                time.sleep(1)  # Wait for response
-                
-                self.handle_confirmation_dialogs()
-                
-                print(f"[SUCCESS] Claimed: {shift['info'][:50]}")
-                return True
-            else:
-                print(f"[SKIP] No claim button found for: {shift['info'][:50]}")
+            if outcome is None:
+                log.warning(f"[FAILED] Not confirmed: {shift['info'][:50]}")
                 return False
+            log.info(f"[SUCCESS] Claimed: {shift['info'][:50]} "
+                     f"(clicked {detect_to_click * 1000:.0f}ms after detection)",
+                     extra=fields(event="claim", shift=shift['id'], detect_to_click_ms=round(detect_to_click * 1000)))
+            return True
                 
+        except PlaywrightTimeoutError:
+            log.info(f"[SKIP] Shift no longer on page: {shift['info'][:50]}")
+            return False
         except Exception as e:
-            print(f"[ERROR] Claim failed: {str(e)[:50]}")
+            log.error(f"[ERROR] Claim failed: {str(e)[:50]}")
             return False
     
-    def handle_confirmation_dialogs(self):
-        """Handle confirmation dialogs if they appear"""
+    def confirmed_outcome(self, outcome, confirm_since, page=None):
+        """A claim's final outcome after the confirm step; None means it wasn't confirmed.
+
+        A claim succeeds only on a seen response: the confirm request's when a
+        dialog was confirmed, else the claim click's. A dialog left unconfirmed
+        is a failure.
+        """
+        if confirm_since is not None:
+            return self.wait_for_claim_outcome('confirm', confirm_since, replaced_sleep=0.5, page=page)
+        return None if outcome == 'dialog' else outcome
+    
+    def record_detect_to_click(self, shift):
+        """Seconds from the scan that found a shift to its claim click"""
+        detect_to_click = time.perf_counter() - shift.get('detected_at', time.perf_counter())
+        self.metrics.observe('detect_to_click', detect_to_click)
+        return detect_to_click
+    
+    def handle_confirmation_dialogs(self, dialog_open=False, page=None, wait=True):
+        """Handle confirmation dialogs if they appear.
+        
+        Returns the page time of the confirm click, or None. With wait=False
+        the confirmation request is left in flight for the caller to await.
+        """
+        page = page or self.page
         try:
-            time.sleep(0.5)
+            dialog_selector = ", ".join(DIALOG_SELECTORS)
+            dialog = None
             
-            dialog_selectors = [
-                "div[role='dialog']",
-                ".modal",
-                ".popup",
-                ".dialog",
-                ".confirmation"
+            # Returns at once if the claim opened a dialog; otherwise one may
+            # still open right after the claim response arrives
+            with self.wait_step('dialog', 0 if dialog_open else 0.5):
+                dialog = page.wait_for_selector(
+                    dialog_selector, state="visible", timeout=WAIT_TIMEOUTS['dialog']
+                )
+            
+            if not dialog:
+                return None
+            
+            confirm_selectors = [
+                "button:has-text('OK')",
+                "button:has-text('Confirm')",
+                "button:has-text('Yes')",
+                "button:has-text('Agree')",
+                "button[type='submit']"
             ]
             
-            for selector in dialog_selectors:
+            for confirm_selector in confirm_selectors:
                 try:
-                    dialog = self.page.query_selector(selector)
-                    if dialog and dialog.is_visible():
-                        confirm_selectors = [
-                            "button:has-text('OK')",
-                            "button:has-text('Confirm')",
-                            "button:has-text('Yes')",
-                            "button:has-text('Agree')",
-                            "button[type='submit']"
-                        ]
-                        
-                        for confirm_selector in confirm_selectors:
-                            try:
-                                confirm_btn = dialog.query_selector(confirm_selector)
-                                if confirm_btn and confirm_btn.is_visible():
-                                    confirm_btn.click(delay=20)
-                                    time.sleep(0.5)
-                                    return
-                            except:
-                                continue
+                    confirm_btn = dialog.query_selector(confirm_selector)
+                    if confirm_btn and confirm_btn.is_visible():
+                        since = self.click_start(page)
+                        confirm_btn.click(delay=20, no_wait_after=not wait)
+                        if wait:
+                            self.wait_for_claim_outcome('confirm', since, replaced_sleep=0.5, page=page)
+                        return since
                 except:
                     continue
         except:
             pass
+        return None
     
-    def show_statistics(self):
-        """Show overall statistics about seen shifts"""
-        if not self.seen_shifts:
+    def wait_for_roster(self, replaced_sleep):
+        """Wait until the roster has rendered instead of sleeping a fixed time"""
+        with self.wait_step('roster', replaced_sleep):
+            if ROSTER_READY_SELECTOR:
+                self.page.wait_for_selector(ROSTER_READY_SELECTOR, timeout=WAIT_TIMEOUTS['roster'])
+            else:
+                self.page.wait_for_function(ROSTER_READY_JS, polling=100, timeout=WAIT_TIMEOUTS['roster'])
+    
+    def click_start(self, page=None):
+        """Page time to pass to wait_for_claim_outcome, taken right before a click"""
+        return (page or self.page).evaluate(CLICK_START_JS)
+    
+    def wait_for_claim_outcome(self, name, since, replaced_sleep, accept_dialog=False, page=None):
+        """Wait for the request started by a click to finish (or a dialog to open)"""
+        outcome = None
+        with self.wait_step(name, replaced_sleep):
+            handle = (page or self.page).wait_for_function(
+                CLAIM_OUTCOME_JS,
+                arg={'dialogSelector': ", ".join(DIALOG_SELECTORS), 'since': since, 'acceptDialog': accept_dialog},
+                polling=50,
+                timeout=WAIT_TIMEOUTS[name]
+            )
+            outcome = handle.json_value()
+        return outcome
+    
+    @contextmanager
+    def wait_step(self, name, replaced_sleep):
+        """Time a condition-based wait; a timeout just ends the wait"""
+        wait_start = time.time()
+        try:
+            yield
+        except PlaywrightTimeoutError:
+            pass
+        finally:
+            self.record_wait(name, time.time() - wait_start, replaced_sleep)
+    
+    def record_wait(self, name, waited, replaced_sleep):
+        """Add a wait to this cycle's latency budget"""
+        budget = self.cycle_waits.setdefault(name, [0, 0.0, 0.0])
+        budget[0] += 1
+        budget[1] += waited
+        budget[2] += replaced_sleep
+    
+    def show_wait_budget(self):
+        """Report time spent waiting this cycle against the old fixed sleeps"""
+        if not self.cycle_waits:
             return
-            
-        total_shifts = len(self.seen_shifts)
         
-        status_counts = {}
-        for shift_data in self.seen_shifts.values():
-            status = shift_data['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
+        waited = sum(budget[1] for budget in self.cycle_waits.values())
+        fixed = sum(budget[2] for budget in self.cycle_waits.values())
+        details = ", ".join(f"{name} {budget[1]:.2f}s/{budget[0]}"
+                            for name, budget in self.cycle_waits.items())
+        log.debug(f"⏱️  Waits this cycle: {waited:.2f}s vs {fixed:.2f}s of fixed sleeps "
+                  f"(saved {fixed - waited:.2f}s) [{details}]")
+        self.cycle_waits = {}
+    
+    def publish_statistics(self):
+        """Hand the running shift counts to the metrics snapshot (O(number of statuses))"""
+        self.metrics.set_gauges(
+            seen=len(self.seen_shifts),
+            claimed=len(self.claimed_shifts),
+            shifts=self.seen_shifts.statuses(),
+            forgotten_past=self.seen_shifts.expired,
+            evicted=self.seen_shifts.evicted
+        )
+    
+    def show_statistics(self):
+        """Log overall statistics from the metrics snapshot (debug detail)"""
+        snapshot = self.metrics.snapshot()
+        gauges = snapshot['gauges']
+        if not gauges.get('seen'):
+            return
+        counters = snapshot['counters']
         
-        runtime = time.time() - self.start_time
+        runtime = snapshot['uptime']
         hours = int(runtime // 3600)
         minutes = int((runtime % 3600) // 60)
         
-        print(f"\n📊 OVERALL STATISTICS:")
-        print(f"   Runtime: {hours}h {minutes}m")
-        print(f"   Total scans: {self.scan_count}")
-        print(f"   Unique shifts seen: {total_shifts}")
-        print(f"   Shifts claimed: {len(self.claimed_shifts)}")
+        lines = ["📊 OVERALL STATISTICS:"]
+        lines.append(f"   Runtime: {hours}h {minutes}m")
+        lines.append(f"   Total scans: {counters['scans']}")
+        lines.append(f"   Unique shifts seen: {gauges['seen']}")
+        lines.append(f"   Shifts claimed: {gauges['claimed']}")
+        claims = counters['claims']
+        attempts = claims + counters['claim_failures']
+        if attempts:
+            lines.append(f"   Claim success: {claims}/{attempts} ({claims / attempts:.0%})")
+        if gauges['forgotten_past'] or gauges['evicted']:
+            lines.append(f"   Forgotten: {gauges['forgotten_past']} past, {gauges['evicted']} evicted")
+        
+        if gauges['shifts']:
+            lines.append(f"   Status breakdown:")
+            for status, count in gauges['shifts'].items():
+                lines.append(f"     {status}: {count}")
+        
+        rates = snapshot['rates']
+        lines.append("   Per minute (" + "/".join(rates['scans']) + "): " + ", ".join(
+            f"{name} " + "/".join(f"{rate:.1f}" for rate in rates[name].values())
+            for name in ('scans', 'claims', 'errors')))
+        
+        if self.fingerprint and self.fingerprint.hits:
+            lines.append(f"   Unchanged scans skipped: {self.fingerprint.hits}/{self.fingerprint.hits + self.fingerprint.misses} "
+                         f"({self.fingerprint.hit_rate:.0%}), ~{self.fingerprint.saved:.1f}s saved")
+        
+        if self.row_selector and (self.row_selector.selector or self.row_selector.fallbacks):
+            lines.append(f"   Shift-row selector: {self.row_selector.selector or 'none'} "
+                         f"({self.row_selector.learned} learned, {self.row_selector.fallbacks} fallbacks)")
+        
+        if self.rotation:
+            lines.append(f"   Roster pages: {self.rotation.count}, {self.rotation.report()}")
         
-        if status_counts:
-            print(f"   Status breakdown:")
-            for status, count in status_counts.items():
-                print(f"     {status}: {count}")
+        if self.standby and self.standby.failovers:
+            blind = self.metrics.summary().get('blind')
+            lines.append(f"   Standby failovers: {self.standby.failovers}"
+                         + (f" (blind p50 {blind[1] * 1000:.0f}ms)" if blind else ""))
+        
+        if self.blocker and self.blocker.reloads:
+            reloads = self.blocker.reloads
+            lines.append(f"   Blocked per reload: {self.blocker.total_blocked / reloads:.0f} requests, "
+                         f"~{self.blocker.total_bytes / reloads / 1024:.0f} KB, ~{self.blocker.total_ms / reloads:.0f}ms")
+        
+        if self.scheduler and self.scheduler.decision_counts:
+            modes = ", ".join(f"{mode} {count}" for mode, count in self.scheduler.decision_counts.items())
+            lines.append(f"   Scheduler decisions: {modes}")
+        
+        phases = self.metrics.summary()
+        if phases:
+            timings = ", ".join(f"{phase} p50 {p50 * 1000:.0f}ms/p95 {p95 * 1000:.0f}ms"
+                                for phase, (count, p50, p95) in phases.items())
+            lines.append(f"   Phase timings: {timings}")
+        
+        log.debug("\n".join(lines))
     
     def restart_browser(self):
         """Restart browser session"""
-        print("🔄 Restarting browser...")
+        log.warning("🔄 Restarting browser...")
+        self.metrics.increment('restarts')
+        restart_start = time.perf_counter()
+        if not self.startup:
+            self.start_profiler()
         try:
             if self.page:
                 self.page.close()
             if self.browser:
                 self.browser.close()
             
-            is_render = os.getenv('RENDER') is not None
+            self.launch_browser()
             
-            if is_render:
-                self.browser = self.playwright.chromium.launch(
-                    headless=True,
-                    args=["--no-sandbox", "--disable-dev-shm-usage"]
-                )
-            else:
-                self.browser = self.playwright.chromium.launch(headless=False)
-            
-            self.page = self.browser.new_page()
-            self.page.set_default_timeout(45000)
-            
-            print("🌐 Loading page...")
-            self.page.goto(self.url, wait_until="load", timeout=45000)
-            time.sleep(5)
-            print("✅ Browser restarted")
+            log.debug("🌐 Loading page...")
+            self.open_roster()
+            if SCAN_MODE == "push":
+                self.install_push_observer()
+            # Claim pages reopen in the next idle period (or on the next claim)
+            log.info("✅ Browser restarted")
             
         except Exception as e:
-            print(f"❌ Failed to restart: {e}")
+            log.error(f"❌ Failed to restart: {e}")
             raise
+        finally:
+            self.metrics.observe('restart', time.perf_counter() - restart_start)
     
     def stop(self):
         """Stop the auto-claimer"""
-        print("\n🛑 Stopping Auto-Claimer...")
-        print(f"📊 FINAL STATISTICS:")
-        print(f"   Total runtime: {(time.time() - self.start_time)/3600:.1f} hours")
-        print(f"   Total scans: {self.scan_count}")
-        print(f"   Unique shifts seen: {len(self.seen_shifts)}")
-        print(f"   Shifts claimed: {len(self.claimed_shifts)}")
+        self.publish_statistics()
+        snapshot = self.metrics.snapshot()
+        runtime_hours = snapshot['uptime'] / 3600
+        lines = [
+            "🛑 Stopping Auto-Claimer. FINAL STATISTICS:",
+            f"   Total runtime: {runtime_hours:.1f} hours",
+            f"   Total scans: {snapshot['counters']['scans']}",
+            f"   Unique shifts seen: {snapshot['gauges']['seen']}",
+            f"   Shifts claimed: {snapshot['gauges']['claimed']}",
+            f"   Errors: {snapshot['counters']['errors']}"
+        ]
+        if self.profile:
+            lines.append(f"   Time to first scan: {self.profile.report()}")
+        log.info("\n".join(lines), extra=fields(event="stop", **snapshot))
+        
+        if self.store:
+            self.flush_state()
+            self.store.close()
+            log.info(f"💾 Tracking data saved to {STATE_DB_PATH}")
+        
+        self.metrics.close()
+        
+        if self.standby:
+            self.standby.discard()
         
         try:
             if self.browser:
@@ -545,28 +1389,18 @@ class RenderShiftAutoClaimer:
                 self.playwright.stop()
         except:
             pass
-        print("✅ Auto-claimer stopped.")
+        log.info("✅ Auto-claimer stopped.")
 
 # ================= MAIN =================
 def main():
-    print("\n" + "="*60)
-    print("🚀 RENDER-HOSTED SHIFT AUTO-CLAIMER")
-    print("="*60)
-    print("⚡ Optimized for Render deployment")
-    print("📝 Running as background service")
-    print("⏰ Auto-stops after 12 hours")
-    print("\n📋 Starting service...\n")
-    
     claimer = RenderShiftAutoClaimer(SHIFT_URL)
     
     try:
         claimer.start()
     except KeyboardInterrupt:
-        print("\n\n👋 Manual stop requested")
+        log.info("👋 Manual stop requested")
     except Exception as e:
-        print(f"\n❌ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.critical(f"❌ Fatal error: {e}", exc_info=True)
     finally:
         claimer.stop()
         sys.exit(0)
@@ -0,0 +1,153 @@
+import re
+import weakref
+from urllib.parse import urlsplit
+
+from claimer_log import log
+
+# ================= CONFIG =================
+BLOCK_RESOURCE_TYPES = ("image", "media", "font", "ping")  # Stylesheets stay: visibility checks need them
+BLOCK_DOMAINS = (  # Requests to these hosts (and their subdomains) are aborted
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "fullstory.com",
+    "mixpanel.com",
+    "intercom.io",
+    "nr-data.net",
+    "newrelic.com",
+    "sentry.io",
+)
+BLOCK_THIRD_PARTY_SCRIPTS = False  # Also abort scripts not served from the roster's own domain
+ALLOWED_URL_PATTERNS = ()  # Regexes for URLs that are never blocked (scripts the roster needs)
+MEASURE_SAVINGS = True  # Reload the roster unblocked once after startup to estimate bytes/ms saved
+# =========================================
+
+
+# ================= REQUEST BLOCKER =================
+class ResourceBlocker:
+    """page.route profile that aborts requests the shift scan doesn't need.
+
+    Routed on the browser context, so the roster page and any claim pages
+    share it. Requests it lets through are handed on with route.fallback(),
+    which keeps page-level routes such as the network shift source working.
+
+    Blocking starts with the startup load. With measure_savings, the first
+    reload after startup is left unblocked and only observed. It records how
+    long a full reload takes and the size of each request that would have
+    been blocked. Later reloads are blocked again and reported against that
+    baseline, and the response listener used for sizes is removed.
+    """
+
+    def __init__(self, site_url, block_types=BLOCK_RESOURCE_TYPES, block_domains=BLOCK_DOMAINS,
+                 block_third_party_scripts=BLOCK_THIRD_PARTY_SCRIPTS, allowed=ALLOWED_URL_PATTERNS,
+                 measure_savings=MEASURE_SAVINGS):
+        self.site_domain = self.registered_domain(urlsplit(site_url).hostname or "")
+        self.block_types = frozenset(block_types)
+        self.block_domains = tuple(domain.lower() for domain in block_domains)
+        self.block_third_party_scripts = block_third_party_scripts
+        self.allowed = re.compile("|".join(f"(?:{pattern})" for pattern in allowed)) if allowed else None
+        self.contexts = weakref.WeakSet()
+
+        # Calibration: None = blocking until the calibration reload, True = observing it, False = done
+        self.calibrating = None if measure_savings else False
+        self.baseline_ms = None
+        self.known_sizes = {}
+        self.type_sizes = {}
+
+        self.reload_blocked = 0
+        self.reload_bytes = 0
+        self.total_blocked = 0
+        self.total_bytes = 0
+        self.total_ms = 0.0
+        self.reloads = 0
+
+    @staticmethod
+    def registered_domain(host):
+        """Last two labels of a host name (deputy.com for x.na.deputy.com)"""
+        return ".".join(host.lower().split(".")[-2:])
+
+    def attach(self, context):
+        """Route every request of a browser context through the blocker"""
+        if context in self.contexts:
+            return
+        self.contexts.add(context)
+        context.route("**/*", self._handle_route)
+        if self.calibrating is not False:
+            context.on("response", self._record_size)
+
+    def should_block(self, url, resource_type):
+        """True if a request is not needed to find and claim shifts"""
+        if self.allowed and self.allowed.search(url):
+            return False
+        if resource_type in self.block_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        for domain in self.block_domains:
+            if host == domain or host.endswith("." + domain):
+                return True
+        return (self.block_third_party_scripts and resource_type == "script"
+                and self.registered_domain(host) != self.site_domain)
+
+    def _handle_route(self, route):
+        request = route.request
+        if not self.should_block(request.url, request.resource_type):
+            route.fallback()
+            return
+        if self.calibrating:
+            # Observing only: let it load so its size can be learned
+            self.reload_blocked += 1
+            route.fallback()
+            return
+        self.reload_blocked += 1
+        self.reload_bytes += self.known_sizes.get(request.url, self.type_sizes.get(request.resource_type, 0))
+        route.abort("blockedbyclient")
+
+    def _record_size(self, response):
+        if not self.calibrating:
+            return
+        request = response.request
+        if not self.should_block(request.url, request.resource_type):
+            return
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            return
+        if size:
+            self.known_sizes[request.url] = size
+            average = self.type_sizes.get(request.resource_type)
+            self.type_sizes[request.resource_type] = size if average is None else (average + size) // 2
+
+    def stop_recording_sizes(self):
+        for context in list(self.contexts):
+            try:
+                context.remove_listener("response", self._record_size)
+            except Exception:
+                pass  # Context already closed
+
+    def start_reload(self):
+        self.reload_blocked = 0
+        self.reload_bytes = 0
+
+    def finish_reload(self, reload_ms):
+        """Account for a finished reload; returns (blocked, bytes saved, ms saved) or None while calibrating"""
+        if self.calibrating is None:
+            # The startup load is cold; calibrate on the next one
+            self.calibrating = True
+            return None
+        if self.calibrating:
+            self.calibrating = False
+            self.stop_recording_sizes()
+            self.baseline_ms = reload_ms
+            log.info(f"📏 Unblocked reload: {reload_ms:.0f}ms, {self.reload_blocked} blockable requests "
+                     f"({sum(self.known_sizes.values()) / 1024:.0f} KB); blocking from now on")
+            return None
+
+        saved_ms = max(0.0, self.baseline_ms - reload_ms) if self.baseline_ms else 0.0
+        self.reloads += 1
+        self.total_blocked += self.reload_blocked
+        self.total_bytes += self.reload_bytes
+        self.total_ms += saved_ms
+        return self.reload_blocked, self.reload_bytes, saved_ms
@@ -0,0 +1,262 @@
+import gzip
+import http.client
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from roster_network import NetworkShiftSource
+from shift_parser import TIME_RANGE_PATTERN
+
+# ================= CONFIG =================
+HTTP_TIMEOUT = 15  # seconds per request
+MAX_IDLE_CONNECTIONS = 4  # keep-alive connections kept per host
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+# =========================================
+
+
+# ================= CONNECTION POOL =================
+class ConnectionPool:
+    """Keeps idle HTTP/1.1 connections open so each poll skips TCP and TLS setup"""
+
+    def __init__(self, max_idle=MAX_IDLE_CONNECTIONS, timeout=HTTP_TIMEOUT):
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.idle = {}
+        self.requests = 0
+        self.reused = 0
+
+    def request(self, method, url, headers=None):
+        """Send a request and return (status, headers, body), reusing a pooled connection"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        conn, reused = self._acquire(key)
+        try:
+            response, body = self._send(conn, method, path, headers)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle connection, retry once on a fresh one
+            conn, reused = self._new_connection(key), False
+            response, body = self._send(conn, method, path, headers)
+
+        self.requests += 1
+        if reused:
+            self.reused += 1
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        return response.status, response_headers, body
+
+    def _send(self, conn, method, path, headers):
+        conn.request(method, path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+
+    def _acquire(self, key):
+        connections = self.idle.get(key)
+        if connections:
+            return connections.pop(), True
+        return self._new_connection(key), False
+
+    def _new_connection(self, key):
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _release(self, key, conn):
+        connections = self.idle.setdefault(key, [])
+        if len(connections) < self.max_idle:
+            connections.append(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection"""
+        for connections in self.idle.values():
+            for conn in connections:
+                conn.close()
+        self.idle = {}
+
+
+# ================= HTML SHIFT PARSER =================
+BLOCK_TAGS = {"div", "td", "li", "p", "tr", "table", "ul", "section", "article"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+CANDIDATE_TAGS = {"div", "span", "td", "li", "p"}
+CLAIM_TEXT = re.compile(r"claim|accept", re.IGNORECASE)
+
+
+class RosterHtmlParser(HTMLParser):
+    """Approximates the in-page extraction on server-rendered roster HTML.
+
+    Every candidate element collects its text (block tags start a new line,
+    like innerText) and whether it contains a Claim/Accept button that is not
+    hidden by a hidden attribute or inline display:none. Candidates holding
+    more than one shift time range are left out.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.skip_depth = 0
+        self.records = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._append_text("\n")
+            return
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        attrs = dict(attrs)
+        style = (attrs.get("style") or "").replace(" ", "").lower()
+        hidden = "hidden" in attrs or "display:none" in style
+        self.stack.append({
+            'order': self.getpos(),
+            'tag': tag,
+            'parts': [],
+            'hidden': hidden or any(node['hidden'] for node in self.stack[-1:]),
+            'button_text': [] if tag in ("button", "a") else None,
+            'claimable': False
+        })
+        if tag in BLOCK_TAGS:
+            self._append_text("\n")
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Close any elements left open inside this one
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index]['tag'] == tag:
+                while len(self.stack) > index:
+                    self._close(self.stack.pop())
+                break
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self._append_text(data)
+
+    def _append_text(self, text):
+        for node in self.stack:
+            node['parts'].append(text)
+            if node['button_text'] is not None:
+                node['button_text'].append(text)
+
+    def _close(self, node):
+        if node['button_text'] is not None and not node['hidden']:
+            if CLAIM_TEXT.search("".join(node['button_text'])):
+                for parent in self.stack:
+                    parent['claimable'] = True
+                node['claimable'] = True
+        if node['tag'] in CANDIDATE_TAGS:
+            lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in "".join(node['parts']).split("\n"))
+            text = "\n".join(line for line in lines if line)
+            if len(TIME_RANGE_PATTERN.findall(text.lower())) > 1:
+                # A block of several shifts, as in the in-page extraction
+                return
+            self.records.append({'order': node['order'], 'text': text, 'claimable': node['claimable']})
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(self.stack.pop())
+        # Document order, as with querySelectorAll
+        self.records.sort(key=lambda record: record['order'])
+        return self.records
+
+
+# ================= POLLER =================
+class RosterHttpPoller:
+    """Polls the roster over HTTP with ETag/Last-Modified revalidation.
+
+    JSON responses are parsed with the network shift source, HTML with
+    RosterHtmlParser. poll() returns (changed, shifts); an unchanged roster
+    (304 or identical body) costs one small request and no parsing.
+    """
+
+    def __init__(self, url, id_func, shift_filter, pool=None):
+        self.url = url
+        self.id_func = id_func
+        self.shift_filter = shift_filter
+        self.pool = pool or ConnectionPool()
+        self.etag = None
+        self.last_modified = None
+        self.last_body = None
+        self.shifts = []
+        self.not_modified = 0
+
+    def poll(self):
+        """Fetch the roster and return (changed, shifts)"""
+        headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json, text/html;q=0.9",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive"
+        }
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        status, response_headers, body = self.pool.request("GET", self.url, headers)
+
+        if status == 304:
+            self.not_modified += 1
+            return False, self.shifts
+        if status != 200:
+            raise RuntimeError(f"Roster poll returned HTTP {status}")
+
+        self.etag = response_headers.get("etag", self.etag)
+        self.last_modified = response_headers.get("last-modified", self.last_modified)
+
+        if response_headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        if body == self.last_body:
+            return False, self.shifts
+        self.last_body = body
+
+        if "json" in response_headers.get("content-type", ""):
+            self.shifts = self.parse_json(body)
+        else:
+            self.shifts = self.parse_html(body.decode("utf-8", errors="replace"))
+        return True, self.shifts
+
+    def parse_json(self, body):
+        source = NetworkShiftSource()
+        source.ingest(json.loads(body))
+        return source.shifts()
+
+    def parse_html(self, html):
+        parser = RosterHtmlParser()
+        parser.feed(html)
+        shifts = []
+        seen_texts = set()
+        for record in parser.close():
+            text = record['text']
+            if len(text) < 20 or text in seen_texts or not self.shift_filter(text):
+                continue
+            seen_texts.add(text)
+            shifts.append({
+                'id': self.id_func(text),
+                'text': text,
+                'status': "MY CLAIM" if record['claimable'] else
+                          "ALREADY CLAIMED" if 'accepted' in text.lower() else "NOT MY CLAIM",
+                'claim_selector': None
+            })
+        return shifts
+
+    def close(self):
+        self.pool.close()
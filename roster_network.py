@@ -0,0 +1,212 @@
+import re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import shift_parser
+
+# ================= CONFIG =================
+# Roster data is loaded by XHR/fetch calls under these paths on the Deputy host
+ROSTER_JSON_URL_PATTERN = re.compile(r"/(api|exec)/")
+# Zone of the roster's location (e.g. "Australia/Sydney") for unix timestamps in the JSON.
+# None = the UTC offset of the payload's localized ISO times (the host's zone until one is seen)
+ROSTER_TIMEZONE = None
+
+# Field names looked up on each roster object (first match wins)
+START_FIELDS = ("StartTimeLocalized", "StartTime", "start")
+END_FIELDS = ("EndTimeLocalized", "EndTime", "end")
+CLAIMABLE_FIELDS = ("CanClaim", "CanAccept", "Open", "OpenShift")
+ACCEPTED_FIELDS = ("Accepted", "Confirmed", "ConfirmStatus")
+LABEL_FIELDS = ("OperationalUnitName", "OperationalUnit", "Comment")
+# =========================================
+
+
+# ================= NETWORK SHIFT SOURCE =================
+class NetworkShiftSource:
+    """Reads shifts from the JSON payloads the roster page loads.
+
+    Works either as a passive page.on("response") listener or, in "route"
+    mode, by intercepting matching requests with page.route and reading the
+    body before handing it back to the page. Each roster object becomes the
+    same {'id', 'info', 'status'} record the DOM scraper produces, so the two
+    sources can be used interchangeably and compared with cross_check. IDs
+    come from the shift's start and end in the roster's own time zone, the
+    way the DOM scraper derives them from the text the page shows.
+    """
+
+    def __init__(self, mode="response", url_pattern=ROSTER_JSON_URL_PATTERN, roster_timezone=ROSTER_TIMEZONE):
+        self.mode = mode
+        self.url_pattern = url_pattern
+        self.roster_zone = ZoneInfo(roster_timezone) if roster_timezone else None
+        self.utc_offset = None
+        self.shifts_by_id = {}
+        self.payload_count = 0
+        self.page = None
+
+    def attach(self, page):
+        """Start capturing roster payloads from a page"""
+        self.page = page
+        if self.mode == "route":
+            page.route(self.url_pattern, self._handle_route)
+        else:
+            page.on("response", self._handle_response)
+
+    def reset(self):
+        """Forget captured shifts before the page is reloaded"""
+        self.shifts_by_id = {}
+        self.payload_count = 0
+
+    @property
+    def has_data(self):
+        return self.payload_count > 0
+
+    def shifts(self):
+        """Shifts parsed from the payloads captured since the last reset"""
+        return list(self.shifts_by_id.values())
+
+    def _handle_response(self, response):
+        try:
+            if not self.url_pattern.search(response.url):
+                return
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "json" not in response.headers.get("content-type", ""):
+                return
+            self.ingest(response.json())
+        except:
+            pass
+
+    def _handle_route(self, route):
+        if route.request.resource_type not in ("xhr", "fetch"):
+            route.fallback()
+            return
+        try:
+            response = route.fetch()
+        except:
+            route.fallback()
+            return
+        try:
+            if "json" in response.headers.get("content-type", ""):
+                self.ingest(response.json())
+        except:
+            pass
+        route.fulfill(response=response)
+
+    def ingest(self, payload):
+        """Parse every roster object found in a JSON payload"""
+        found = False
+        for obj in iter_roster_objects(payload):
+            shift = self.parse_roster_object(obj)
+            if shift:
+                self.shifts_by_id[shift['id']] = shift
+                found = True
+        if found:
+            self.payload_count += 1
+
+    def parse_roster_object(self, obj):
+        """Turn a single roster object into a shift record"""
+        start = self.roster_time(first_field(obj, START_FIELDS))
+        end = self.roster_time(first_field(obj, END_FIELDS))
+        if not start or not end:
+            return None
+
+        text = f"{format_day(start)} {format_time(start)} - {format_time(end)}"
+        label = first_field(obj, LABEL_FIELDS)
+        if isinstance(label, dict):
+            label = first_field(label, ("Name", "OperationalUnitName"))
+        info = f"{text} | {label}" if isinstance(label, str) and label else text
+
+        if any(is_truthy(obj.get(field)) for field in CLAIMABLE_FIELDS):
+            status = "MY CLAIM"
+        elif any(is_truthy(obj.get(field)) for field in ACCEPTED_FIELDS):
+            status = "ALREADY CLAIMED"
+        else:
+            status = "NOT MY CLAIM"
+
+        return {
+            'id': shift_parser.shift_id_from_times(start, end),
+            'text': text,
+            'info': info,
+            'status': status,
+            'claim_selector': None
+        }
+
+    def roster_time(self, value):
+        """A payload timestamp as a naive datetime in the roster's time zone"""
+        parsed = parse_timestamp(value, self.roster_zone or self.utc_offset)
+        if parsed is None or parsed.tzinfo is None:
+            return parsed
+        if isinstance(value, str):
+            # Localized times carry the roster's offset; use it for bare unix times too
+            self.utc_offset = timezone(parsed.utcoffset())
+        return parsed.replace(tzinfo=None)
+
+    def cross_check(self, dom_shifts):
+        """Compare network shifts with DOM-scraped shifts by ID and status"""
+        dom_by_id = {shift['id']: shift for shift in dom_shifts}
+        net_ids = set(self.shifts_by_id)
+        dom_ids = set(dom_by_id)
+
+        return {
+            'missing_in_network': sorted(dom_ids - net_ids),
+            'missing_in_dom': sorted(net_ids - dom_ids),
+            'status_mismatch': sorted(
+                shift_id for shift_id in net_ids & dom_ids
+                if self.shifts_by_id[shift_id]['status'] != dom_by_id[shift_id]['status']
+            )
+        }
+
+
+# ================= PAYLOAD HELPERS =================
+def iter_roster_objects(payload):
+    """Yield every dict in a JSON payload that carries start and end times"""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if first_field(node, START_FIELDS) is not None and first_field(node, END_FIELDS) is not None:
+                yield node
+            else:
+                stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def first_field(obj, fields):
+    for field in fields:
+        value = obj.get(field)
+        if value is not None:
+            return value
+    return None
+
+
+def is_truthy(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "accepted", "confirmed")
+    return bool(value)
+
+
+def parse_timestamp(value, tz=None):
+    """Parse a unix timestamp (shown in tz, or the host's zone) or an ISO-8601 string.
+
+    ISO strings keep the wall time they were written in, with their offset
+    if they have one.
+    """
+    try:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value, tz)
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        pass
+    return None
+
+
+def format_day(dt):
+    """Format like the roster page, e.g. 'Wed 17 Dec'"""
+    return f"{dt:%a} {dt.day} {dt:%b}"
+
+
+def format_time(dt):
+    """Format like the roster page, e.g. '9:30 am'"""
+    hour = dt.hour % 12 or 12
+    return f"{hour}:{dt:%M} {'am' if dt.hour < 12 else 'pm'}"
@@ -0,0 +1,141 @@
+import json
+import os
+
+from claimer_log import log
+
+# ================= CONFIG =================
+ROW_SELECTOR_CACHE_PATH = "row_selectors.json"  # Learned shift-row selectors per roster, None = always scan every candidate
+RELEARN_AFTER_SCANS = 20  # Full extractions to wait before trying again when no row selector could be learned
+# =========================================
+
+# Finds the shift rows among the candidates (the outermost candidates holding
+# exactly one shift time range) and returns the shortest CSS selector that
+# matches those rows and nothing else, or null. Tried in order: tag plus the
+# classes every row shares, tag plus an attribute every row has, then the tag
+# path from the nearest ancestor with an id. Refuses to learn when the rows
+# don't account for every time range on the page, or when two rows have the
+# same text, since the learned scan could not tell those apart from a layout
+# change.
+LEARN_ROW_SELECTOR_JS = """
+(selector) => {
+    const RANGE_RE = /\\b\\d{1,2}:\\d{2}\\s*(?:am|pm)\\s*-\\s*\\d{1,2}:\\d{2}\\s*(?:am|pm)/g;
+    const counts = new Map();
+    const ranges = (el) => {
+        if (!counts.has(el)) {
+            counts.set(el, ((el.innerText || '').toLowerCase().match(RANGE_RE) || []).length);
+        }
+        return counts.get(el);
+    };
+
+    const singles = new Set([...document.querySelectorAll(selector)].filter((el) => ranges(el) === 1));
+    const rows = [...singles].filter((el) => {
+        const outer = el.parentElement && el.parentElement.closest(selector);
+        return !outer || !singles.has(outer);
+    });
+    if (rows.length === 0 || rows.length < ranges(document.body)) return null;
+    if (new Set(rows.map((row) => row.innerText.trim())).size !== rows.length) return null;
+
+    const tag = rows[0].tagName.toLowerCase();
+    if (rows.some((row) => row.tagName.toLowerCase() !== tag)) return null;
+
+    const signatures = [];
+    const classes = [...rows[0].classList].filter((name) => rows.every((row) => row.classList.contains(name)));
+    if (classes.length) signatures.push(tag + classes.map((name) => '.' + CSS.escape(name)).join(''));
+    for (const name of rows[0].getAttributeNames()) {
+        if (['class', 'style', 'id'].includes(name) || name.startsWith('data-glee')) continue;
+        if (rows.every((row) => row.hasAttribute(name))) signatures.push(`${tag}[${CSS.escape(name)}]`);
+    }
+    const pathOf = (row) => {
+        const parts = [tag];
+        let node = row.parentElement;
+        while (node && node !== document.body && !node.id) {
+            parts.unshift(node.tagName.toLowerCase());
+            node = node.parentElement;
+        }
+        const anchor = node && node.id ? '#' + CSS.escape(node.id) : 'body';
+        return anchor + ' > ' + parts.join(' > ');
+    };
+    const path = pathOf(rows[0]);
+    if (rows.every((row) => pathOf(row) === path)) signatures.push(path);
+
+    for (const signature of signatures) {
+        const matched = document.querySelectorAll(signature);
+        if (matched.length === rows.length && rows.every((row) => row.matches(signature))) return signature;
+    }
+    return null;
+}
+"""
+
+
+# ================= LEARNED ROW SELECTOR =================
+class LearnedRowSelector:
+    """CSS selector for one roster's shift rows, learned on a full scan.
+
+    The candidate selector (div, span, td, li, p) also matches every ancestor
+    of a shift, so a full scan reads the text of most of the page. Once the
+    rows are known, scans query only them. The cost then grows with the number
+    of shifts rather than with the size of the page. The page tells us when the
+    selector stops matching (the rows hold fewer shift times than the page
+    shows). The scan then falls back to the candidate selector and learns
+    again. Selectors are kept per roster in a small JSON file, so a restart
+    doesn't have to relearn.
+    """
+
+    def __init__(self, roster, path=ROW_SELECTOR_CACHE_PATH, relearn_after=RELEARN_AFTER_SCANS):
+        self.roster = roster
+        self.path = path
+        self.relearn_after = relearn_after
+        self.since_attempt = relearn_after
+        self.fallbacks = 0
+        self.learned = 0
+        self.selector = self.load().get(roster)
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        selectors = self.load()
+        if self.selector:
+            selectors[self.roster] = self.selector
+        else:
+            selectors.pop(self.roster, None)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(selectors, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            log.warning(f"⚠️  Could not save the shift-row selector: {e}")
+
+    def scan_args(self, learn=True):
+        """Extraction arguments: the learned selector, and whether the page may learn a new one"""
+        return {
+            'rowSelector': self.selector,
+            'learn': learn and (self.selector is not None or self.since_attempt >= self.relearn_after)
+        }
+
+    def update(self, result):
+        """Account for an extraction result from the page"""
+        if result['fallback']:
+            self.fallbacks += 1
+            log.warning(f"🔁 Shift-row selector {self.selector} no longer covers the roster; scanning every candidate")
+        if not result['learned']:
+            if result['fallback']:
+                self.selector = None
+                self.since_attempt = 0
+            elif self.selector is None:
+                self.since_attempt += 1
+            return
+
+        self.since_attempt = 0
+        selector = result['rowSelector']
+        if selector != self.selector:
+            if selector:
+                self.learned += 1
+                log.info(f"🎓 Learned shift-row selector: {selector}")
+            self.selector = selector
+            self.save()
@@ -0,0 +1,49 @@
+# ================= CONFIG =================
+FULL_SCAN_EVERY = 10  # Full extraction at least every N scans even if the roster looks unchanged, 0 = off
+# =========================================
+
+
+# ================= FINGERPRINT TRACKER =================
+class ScanFingerprint:
+    """Decides when a scan can skip extraction because the roster is unchanged.
+
+    The page computes the fingerprint (a hash of the roster text and the
+    state of its buttons and links) in the same round trip as the extraction.
+    It only extracts when the fingerprint differs from the one passed in. A
+    full scan is forced every full_scan_every scans as a guard against hash
+    collisions or changes the fingerprint doesn't cover.
+    """
+
+    def __init__(self, full_scan_every=FULL_SCAN_EVERY):
+        self.full_scan_every = full_scan_every
+        self.previous = None
+        self.since_full = 0
+        self.hits = 0
+        self.misses = 0
+        self.full_cost = None
+        self.saved = 0.0
+
+    def expected(self):
+        """Fingerprint that lets the page skip extraction, or None when a full scan is due"""
+        if self.since_full + 1 >= self.full_scan_every:
+            return None
+        return self.previous
+
+    def record(self, fingerprint, seconds, changed):
+        """Account for one scan and how long it took"""
+        if changed:
+            self.misses += 1
+            self.since_full = 0
+            # Smoothed cost of a full extraction + status pass
+            self.full_cost = seconds if self.full_cost is None else 0.8 * self.full_cost + 0.2 * seconds
+        else:
+            self.hits += 1
+            self.since_full += 1
+            if self.full_cost is not None:
+                self.saved += max(0.0, self.full_cost - seconds)
+        self.previous = fingerprint
+
+    @property
+    def hit_rate(self):
+        scans = self.hits + self.misses
+        return self.hits / scans if scans else 0.0
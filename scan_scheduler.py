@@ -0,0 +1,122 @@
+import random
+import time
+from collections import namedtuple
+
+# ================= CONFIG =================
+MIN_INTERVAL = 5  # seconds, used in burst mode and the hottest windows
+MAX_INTERVAL = 180  # seconds, longest idle back-off
+BURST_SECONDS = 600  # stay in burst mode this long after a new shift appears
+IDLE_BACKOFF = 1.25  # interval multiplier per consecutive idle scan
+COLD_FACTOR = 1.5  # extra interval multiplier in cold windows
+MAX_IDLE_FACTOR = 2  # cap on the idle/cold back-off multiplier, so a quiet window is never polled much slower than base
+HOT_LIFT = 1.5  # window is "hot" when shifts appear this many times more often than average
+COLD_LIFT = 0.5  # window is "cold" below this lift
+MIN_HISTORY = 5  # posting events needed before the histograms are trusted
+PRIOR_EVENTS = 14  # pseudo-events spread evenly over hours and days, so a window without history isn't cold
+POSTING_GAP = 60  # seconds; shifts first seen within this of each other count as one posting event
+JITTER = 0.2  # +/- fraction of randomness added to every interval
+# =========================================
+
+ScanDecision = namedtuple("ScanDecision", ["interval", "mode", "lift"])
+
+
+# ================= ADAPTIVE SCHEDULER =================
+class AdaptiveScanScheduler:
+    """Chooses the wait before the next scan from when shifts tend to be posted.
+
+    Every posting event (one or more shifts appearing together) is recorded
+    in an hour-of-day and a day-of-week histogram. The lift of the current
+    window (how much more often shifts appear now than on average) speeds up
+    or slows down polling, consecutive idle scans back off up to
+    MAX_IDLE_FACTOR, and any new shift switches to burst mode for
+    BURST_SECONDS. Both histograms start from PRIOR_EVENTS spread evenly, so
+    a window only turns cold once there is real evidence that nothing gets
+    posted in it. clock and rng are injectable so decisions can be replayed
+    with a fake clock.
+    """
+
+    def __init__(self, base_interval, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 burst_seconds=BURST_SECONDS, clock=time.time, rng=random.random):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.burst_seconds = burst_seconds
+        self.clock = clock
+        self.rng = rng
+        self.hour_counts = [0] * 24
+        self.day_counts = [0] * 7
+        self.total = 0
+        self.idle_scans = 0
+        self.burst_until = 0
+        self.primed = False
+        self.decision_counts = {}
+
+    def observe(self, timestamps):
+        """Add the first-seen times (epoch seconds) of posted shifts to the histograms.
+
+        Shifts first seen within POSTING_GAP of each other were posted
+        together and count as a single event.
+        """
+        previous = None
+        for ts in sorted(timestamps):
+            if previous is not None and ts - previous <= POSTING_GAP:
+                previous = ts
+                continue
+            previous = ts
+            local = time.localtime(ts)
+            self.hour_counts[local.tm_hour] += 1
+            self.day_counts[local.tm_wday] += 1
+            self.total += 1
+
+    def record_scan(self, new_shift_count):
+        """Update state after a scan that found new_shift_count new shifts"""
+        if not self.primed:
+            # Everything on the page is "new" on the first scan, so it says
+            # nothing about when shifts get posted
+            self.primed = True
+            return
+
+        if new_shift_count:
+            now = self.clock()
+            self.observe([now])
+            self.burst_until = now + self.burst_seconds
+            self.idle_scans = 0
+        else:
+            self.idle_scans += 1
+
+    def lift(self, ts=None):
+        """How much more often shifts are posted in this window than on average"""
+        if self.total < MIN_HISTORY:
+            return 1.0
+        local = time.localtime(self.clock() if ts is None else ts)
+        # Smooth over neighbouring hours so a post at 9:58 still warms up 10:00
+        hour = local.tm_hour
+        hour_share = sum(self.hour_counts[(hour + offset) % 24] for offset in (-1, 0, 1)) / 3
+        total = self.total + PRIOR_EVENTS
+        hour_lift = (hour_share + PRIOR_EVENTS / 24) / (total / 24)
+        day_lift = (self.day_counts[local.tm_wday] + PRIOR_EVENTS / 7) / (total / 7)
+        return hour_lift * day_lift
+
+    def next_interval(self):
+        """Decide how long to wait before the next scan"""
+        now = self.clock()
+        lift = self.lift(now)
+
+        if now < self.burst_until:
+            mode = "burst"
+            interval = self.min_interval
+        elif lift >= HOT_LIFT:
+            mode = "hot"
+            interval = self.base_interval / min(lift, self.base_interval / self.min_interval)
+        else:
+            mode = "cold" if lift <= COLD_LIFT else "idle"
+            factor = IDLE_BACKOFF ** self.idle_scans
+            if mode == "cold":
+                factor *= COLD_FACTOR
+            interval = self.base_interval * min(factor, MAX_IDLE_FACTOR)
+
+        interval *= 1 + JITTER * (2 * self.rng() - 1)
+        interval = max(self.min_interval, min(self.max_interval, interval))
+
+        self.decision_counts[mode] = self.decision_counts.get(mode, 0) + 1
+        return ScanDecision(interval, mode, lift)
@@ -0,0 +1,159 @@
+import re
+import sys
+import time
+from collections import OrderedDict
+from datetime import date
+
+from shift_parser import MONTHS, infer_date
+
+# ================= CONFIG =================
+SEEN_SHIFTS_MAX = 5000  # Most shifts tracked per roster (least recently seen are evicted), None = unbounded
+# =========================================
+
+DAY_MONTH_PATTERN = re.compile(r"(?<!\d)(\d{1,2})[\s_]+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)", re.IGNORECASE)
+
+
+def shift_day_from_text(text, today=None):
+    """Date ordinal of a shift from text like 'Wed 17 Dec', or 0 if there is none.
+
+    The roster omits the year, so the year that puts the date nearest today
+    is used (a December roster viewed in January is last year's).
+    """
+    match = DAY_MONTH_PATTERN.search(text)
+    if not match:
+        return 0
+    shift_date = infer_date(int(match.group(1)), MONTHS[match.group(2).lower()], today)
+    return shift_date.toordinal() if shift_date else 0
+
+
+# ================= RECORD =================
+class ShiftRecord:
+    """One seen shift: interned status, integer timestamps and the shift's date ordinal"""
+
+    __slots__ = ("status", "info", "first_seen", "last_seen", "shift_day")
+
+    def __init__(self, status, info, first_seen, last_seen, shift_day):
+        self.status = sys.intern(status)
+        self.info = info
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.shift_day = shift_day
+
+    def __repr__(self):
+        return f"ShiftRecord({self.status!r}, {self.info!r}, shift_day={self.shift_day})"
+
+
+# ================= INDEX =================
+class SeenShiftIndex:
+    """Bounded index of seen shifts keyed by shift ID.
+
+    Entries expire once the shift's own date has passed, and with a size cap
+    the least recently seen entry is evicted first. Lookups stay O(1), and
+    the number of shifts per status is kept up to date on every insert,
+    status change and removal, so reading it never walks the index.
+    """
+
+    def __init__(self, max_size=SEEN_SHIFTS_MAX, clock=time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self.records = OrderedDict()
+        self.last_expiry_day = 0
+        self.expired = 0
+        self.evicted = 0
+        self.status_counts = {}
+
+    def __contains__(self, shift_id):
+        return shift_id in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, shift_id):
+        return self.records[shift_id]
+
+    def get(self, shift_id, default=None):
+        return self.records.get(shift_id, default)
+
+    def values(self):
+        return self.records.values()
+
+    def items(self):
+        return self.records.items()
+
+    def seen(self, shift_id):
+        """True if the shift is known; marks it as recently seen"""
+        record = self.records.get(shift_id)
+        if record is None:
+            return False
+        record.last_seen = int(self.clock())
+        self.records.move_to_end(shift_id)
+        return True
+
+    def add(self, shift_id, status, info, first_seen=None, last_seen=None, shift_day=None):
+        """Insert or replace a shift and return its record"""
+        first_seen = int(first_seen if first_seen is not None else self.clock())
+        last_seen = int(last_seen) if last_seen is not None else first_seen
+        if shift_day is None:
+            today = date.fromtimestamp(self.clock())
+            shift_day = shift_day_from_text(info or "", today) or shift_day_from_text(shift_id, today)
+
+        record = ShiftRecord(status, info, first_seen, last_seen, shift_day)
+        replaced = self.records.get(shift_id)
+        if replaced is not None:
+            self._count(replaced.status, -1)
+        self._count(record.status, 1)
+        self.records[shift_id] = record
+        self.records.move_to_end(shift_id)
+
+        if self.max_size and len(self.records) > self.max_size:
+            _, evicted = self.records.popitem(last=False)
+            self._count(evicted.status, -1)
+            self.evicted += 1
+        return record
+
+    def set_status(self, shift_id, status):
+        """Change a known shift's status; returns False if the shift isn't tracked"""
+        record = self.records.get(shift_id)
+        if record is None:
+            return False
+        self._count(record.status, -1)
+        record.status = sys.intern(status)
+        self._count(record.status, 1)
+        return True
+
+    def _count(self, status, change):
+        count = self.status_counts.get(status, 0) + change
+        if count:
+            self.status_counts[status] = count
+        else:
+            del self.status_counts[status]
+
+    def statuses(self):
+        """{status: number of tracked shifts}, a copy of the running counts"""
+        return dict(self.status_counts)
+
+    def is_past(self, shift_day, today=None):
+        """True for a shift dated before today; such shifts are expired, not new.
+
+        A fixed-week roster keeps showing past shifts after expire() has
+        dropped them, so a scan must not take them for newly posted ones.
+        """
+        today_ordinal = (today or date.fromtimestamp(self.clock())).toordinal()
+        return 0 < shift_day < today_ordinal
+
+    def expire(self, today=None):
+        """Drop shifts dated before today; returns the removed shift IDs.
+
+        Only walks the index when the date has changed since the last call.
+        """
+        today_ordinal = (today or date.fromtimestamp(self.clock())).toordinal()
+        if today_ordinal == self.last_expiry_day:
+            return []
+        self.last_expiry_day = today_ordinal
+
+        removed = [shift_id for shift_id, record in self.records.items()
+                   if 0 < record.shift_day < today_ordinal]
+        for shift_id in removed:
+            self._count(self.records.pop(shift_id).status, -1)
+        self.expired += len(removed)
+        return removed
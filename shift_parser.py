@@ -0,0 +1,184 @@
+import hashlib
+import re
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple, Optional
+
+# ================= PATTERNS =================
+# Compiled once at import; all matching runs on the lower-cased text
+DAY_NAMES = "mon|tue|wed|thu|fri|sat|sun|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+# A day name between spaces (or at either end), as in ' mon ' in ' text '
+DAY_TOKEN_PATTERN = re.compile(rf"(?:^| )(?:{DAY_NAMES})(?= |$)")
+LINE_DAY_PATTERN = re.compile(rf"\b(?:{DAY_NAMES})\b")
+DATE_PATTERN = re.compile(rf"\b({DAY_NAMES})\s+(\d{{1,2}})\s+(\w{{3}})")
+TIME_PATTERN = re.compile(r"\b\d{1,2}:\d{2}\s*(?:am|pm)\b")
+TIME_RANGE_PATTERN = re.compile(r"\b(\d{1,2}):(\d{2})\s*(am|pm)\s*-\s*(\d{1,2}):(\d{2})\s*(am|pm)")
+TIMEZONE_PATTERN = re.compile(r"\b(est|edt|cst|cdt|mst|mdt|pst|pdt|utc|gmt|aest|aedt|acst|awst)\b")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+INFO_WORDS = ("am", "pm", "est")
+
+
+# ================= SHIFT RECORD =================
+class Shift(NamedTuple):
+    """A parsed shift. Date fields are None when the text doesn't carry them."""
+    id: str
+    info: str
+    day: Optional[str]
+    date: Optional[date]
+    start: Optional[datetime]
+    end: Optional[datetime]
+    timezone: Optional[str]
+    text: str
+
+    @property
+    def duration(self):
+        """Length of the shift as a timedelta, or None"""
+        if self.start and self.end:
+            return self.end - self.start
+        return None
+
+
+# ================= SINGLE-TEXT API =================
+def is_shift_text(text):
+    """Check if text contains shift information"""
+    return _is_shift(text.lower())
+
+
+def shift_id(text):
+    """Stable ID from the shift's date and time range (hash of the text otherwise)"""
+    return _shift_id(text, text.lower())
+
+
+def shift_id_from_times(start, end):
+    """The ID a shift with these start and end datetimes gets from its text, e.g. 'wed_17_dec_9:30_am_-_5:00_pm'"""
+    return (f"{start:%a}_{start.day}_{start:%b}_{_clock_text(start)}_-_{_clock_text(end)}").lower()
+
+
+def shift_info(text):
+    """Clean one-line display info for a shift"""
+    lower = text.lower()
+    return _shift_info(text, TIME_PATTERN.search(lower) is not None)
+
+
+def parse_shift(text, today=None):
+    """Parse a shift's text into a Shift record in one pass over the text"""
+    lower = text.lower()
+    date_match = DATE_PATTERN.search(lower)
+    range_match = TIME_RANGE_PATTERN.search(lower)
+
+    if date_match and range_match:
+        identifier = _canonical_id(date_match, range_match)
+    else:
+        identifier = hashlib.md5(text[:100].encode()).hexdigest()[:12]
+
+    day = shift_date = start = end = None
+    if date_match:
+        day = date_match.group(1)[:3]
+        month = MONTHS.get(date_match.group(3))
+        if month:
+            shift_date = infer_date(int(date_match.group(2)), month, today)
+
+    if shift_date and range_match:
+        hour, minute, meridiem, end_hour, end_minute, end_meridiem = range_match.groups()
+        start = datetime.combine(shift_date, _clock_time(hour, minute, meridiem))
+        end = datetime.combine(shift_date, _clock_time(end_hour, end_minute, end_meridiem))
+        if end <= start:
+            # Overnight shift
+            end += timedelta(days=1)
+
+    timezone_match = TIMEZONE_PATTERN.search(lower)
+    timezone = timezone_match.group(1).upper() if timezone_match else None
+
+    info = _shift_info(text, range_match is not None or TIME_PATTERN.search(lower) is not None)
+    return Shift(identifier, info, day, shift_date, start, end, timezone, text)
+
+
+# ================= BATCH API =================
+def parse_shifts(texts, today=None, only_shifts=True):
+    """Parse many texts; non-shift texts are skipped unless only_shifts is False"""
+    today = today or date.today()
+    return [parse_shift(text, today) for text in texts
+            if not only_shifts or _is_shift(text.lower())]
+
+
+def shift_ids(texts):
+    """IDs for many texts"""
+    return [_shift_id(text, text.lower()) for text in texts]
+
+
+# ================= HELPERS =================
+def infer_date(day, month, today=None):
+    """Date for a day/month without a year, using the year that puts it nearest today"""
+    today = today or date.today()
+    best = None
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if best is None or abs((candidate - today).days) < abs((best - today).days):
+            best = candidate
+    return best
+
+
+def _is_shift(lower):
+    if not DAY_TOKEN_PATTERN.search(lower):
+        return False
+    return (TIME_PATTERN.search(lower) is not None or ' est' in lower
+            or 'shift' in lower or 'glo' in lower)
+
+
+def _shift_id(text, lower):
+    date_match = DATE_PATTERN.search(lower)
+    if date_match:
+        range_match = TIME_RANGE_PATTERN.search(lower)
+        if range_match:
+            return _canonical_id(date_match, range_match)
+    return hashlib.md5(text[:100].encode()).hexdigest()[:12]
+
+
+def _canonical_id(date_match, range_match):
+    # Built from the parsed parts rather than the matched text, so "Wednesday
+    # 17 Dec 09:30am-5:00pm" and "Wed 17 Dec 9:30 am - 5:00 pm" (the network
+    # source's rendering) get the same ID
+    day_name, day_number, month = date_match.groups()
+    hour, minute, meridiem, end_hour, end_minute, end_meridiem = range_match.groups()
+    return (f"{day_name[:3]}_{int(day_number)}_{month}_"
+            f"{int(hour)}:{minute}_{meridiem}_-_{int(end_hour)}:{end_minute}_{end_meridiem}")
+
+
+def _clock_text(dt):
+    return f"{dt.hour % 12 or 12}:{dt.minute:02d}_{'am' if dt.hour < 12 else 'pm'}"
+
+
+def _shift_info(text, has_time):
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+    # No line can have a time if the whole text has none
+    if has_time:
+        shift_lines = []
+        for line in lines:
+            line_lower = line.lower()
+            if TIME_PATTERN.search(line_lower) and LINE_DAY_PATTERN.search(line_lower):
+                shift_lines.append(WHITESPACE_PATTERN.sub(' ', line))
+                if len(shift_lines) == 2:
+                    break
+        if shift_lines:
+            return " | ".join(shift_lines)
+
+    for line in lines:
+        if len(line) > 10:
+            line_lower = line.lower()
+            if any(word in line_lower for word in INFO_WORDS):
+                return line[:80]
+
+    return text[:60]
+
+
+def _clock_time(hour, minute, meridiem):
+    hour = int(hour) % 12
+    if meridiem == "pm":
+        hour += 12
+    return time(hour, int(minute))
@@ -0,0 +1,141 @@
+import hashlib
+import sqlite3
+import time
+
+# ================= CONFIG =================
+STATE_DB_PATH = "shift_state.db"  # Shared by every worker process on this host
+CLAIM_LEASE_SECONDS = 120  # A claim started this long ago without being recorded may be retried
+# =========================================
+
+
+def roster_key(url):
+    """Short stable key for a roster URL"""
+    return hashlib.sha1(url.encode()).hexdigest()[:12]
+
+
+# ================= SHIFT STORE =================
+class ShiftStore:
+    """Seen/claimed shift tracking in a local SQLite database (WAL mode).
+
+    Any number of processes can open the same file. mark_seen and
+    mark_claimed are atomic INSERT OR IGNOREs that return True only for the
+    first caller, so a shift is processed by exactly one worker. Claiming
+    is leased: start_claim lets one worker at a time try a shift that has no
+    claimed row, and a claim that fails, or whose worker dies before
+    mark_claimed, can be taken again once released or once the lease runs
+    out. A single claimer instead loads its roster once at start-up with
+    load and saves each scan's changes in one transaction with write_batch.
+    """
+
+    def __init__(self, path=STATE_DB_PATH, check_same_thread=True):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen (
+                roster TEXT NOT NULL,
+                shift_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                info TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                posted INTEGER NOT NULL DEFAULT 0,
+                claim_started REAL,
+                PRIMARY KEY (roster, shift_id)
+            );
+            CREATE TABLE IF NOT EXISTS claimed (
+                roster TEXT NOT NULL,
+                shift_id TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                PRIMARY KEY (roster, shift_id)
+            );
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen)")}
+        if "claim_started" not in columns:
+            # Databases written before claims were leased
+            self.conn.execute("ALTER TABLE seen ADD COLUMN claim_started REAL")
+
+    def mark_seen(self, roster, shift_id, status, info, seen_at=None):
+        """Record a shift; returns False if it was already recorded"""
+        seen_at = seen_at or time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO seen (roster, shift_id, status, info, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (roster, shift_id, status, info, seen_at, seen_at)
+        )
+        return cursor.rowcount == 1
+
+    def mark_claimed(self, roster, shift_id, claimed_at=None):
+        """Record a claim; returns False if the shift was already claimed"""
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO claimed (roster, shift_id, claimed_at) VALUES (?, ?, ?)",
+            (roster, shift_id, claimed_at or time.time())
+        )
+        return cursor.rowcount == 1
+
+    def start_claim(self, roster, shift_id, lease=CLAIM_LEASE_SECONDS, now=None):
+        """Take the claim lease on a seen shift; returns False if it's claimed or another worker holds the lease"""
+        now = now or time.time()
+        cursor = self.conn.execute(
+            "UPDATE seen SET claim_started = ? WHERE roster = ? AND shift_id = ? "
+            "AND (claim_started IS NULL OR claim_started < ?) "
+            "AND NOT EXISTS (SELECT 1 FROM claimed WHERE roster = ? AND shift_id = ?)",
+            (now, roster, shift_id, now - lease, roster, shift_id)
+        )
+        return cursor.rowcount == 1
+
+    def release_claim(self, roster, shift_id):
+        """Give up the claim lease after a failed claim so the shift can be retried"""
+        self.conn.execute(
+            "UPDATE seen SET claim_started = NULL WHERE roster = ? AND shift_id = ?", (roster, shift_id)
+        )
+
+    def load(self, roster):
+        """Return (seen rows, claimed shift IDs) for a roster.
+
+        Seen rows are (shift_id, status, info, first_seen, last_seen, posted)
+        tuples; posted marks shifts that appeared while already being watched.
+        """
+        seen = self.conn.execute(
+            "SELECT shift_id, status, info, first_seen, last_seen, posted FROM seen WHERE roster = ?",
+            (roster,)
+        ).fetchall()
+        claimed = self.conn.execute(
+            "SELECT shift_id FROM claimed WHERE roster = ?", (roster,)
+        ).fetchall()
+        return seen, {row[0] for row in claimed}
+
+    def write_batch(self, roster, seen_rows, claimed):
+        """Save one scan's new/updated shifts and claims in a single transaction.
+
+        seen_rows are (shift_id, status, info, first_seen, last_seen, posted)
+        tuples; an existing row keeps its first_seen and gets the new status.
+        """
+        if not seen_rows and not claimed:
+            return
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT INTO seen (roster, shift_id, status, info, first_seen, last_seen, posted) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (roster, shift_id) DO UPDATE SET "
+                "status = excluded.status, last_seen = excluded.last_seen",
+                [(roster, *row) for row in seen_rows]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO claimed (roster, shift_id, claimed_at) VALUES (?, ?, ?)",
+                [(roster, shift_id, claimed_at) for shift_id, claimed_at in claimed]
+            )
+
+    def forget(self, roster, shift_ids):
+        """Delete seen shifts that no longer need tracking (claims are kept)"""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "DELETE FROM seen WHERE roster = ? AND shift_id = ?",
+                [(roster, shift_id) for shift_id in shift_ids]
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+import claimer_log
+from async_roster_engine import SHIFT_URLS, AsyncRosterEngine
+from claimer_log import fields, log
+from render_shift_claimer import MAX_RUNTIME_HOURS
+from shift_store import STATE_DB_PATH, ShiftStore
+
+# ================= CONFIG =================
+WORKER_COUNT = os.cpu_count() or 1  # Worker processes (capped at the number of rosters)
+CHECK_INTERVAL = 10  # seconds between worker health checks
+REPORT_INTERVAL = 60  # seconds between throughput reports
+RESTART_BACKOFF = 5  # seconds before a crashed worker is restarted
+# =========================================
+
+
+def shard_urls(urls, worker_count):
+    """Split roster URLs round-robin into at most worker_count shards"""
+    worker_count = max(1, min(worker_count, len(urls)))
+    return [urls[i::worker_count] for i in range(worker_count)]
+
+
+def worker_main(index, urls, db_path, scan_counter):
+    """Entry point of a worker process: one browser watching its shard of rosters"""
+    # A spawned process starts without the parent's log handlers
+    claimer_log.setup()
+    store = ShiftStore(db_path)
+    engine = AsyncRosterEngine(urls, store=store, scan_counter=scan_counter, name_prefix=f"w{index}")
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+# ================= SUPERVISOR =================
+class ShiftSupervisor:
+    """Shards rosters across worker processes and restarts any that die.
+
+    Workers share seen/claimed state through the SQLite ShiftStore so a
+    shift is never processed twice, and report each scan through a shared
+    counter used for the rosters-per-second report.
+    """
+
+    def __init__(self, urls, worker_count=WORKER_COUNT, db_path=STATE_DB_PATH):
+        self.shards = shard_urls(urls, worker_count)
+        self.db_path = db_path
+        self.ctx = multiprocessing.get_context("spawn")
+        self.workers = [None] * len(self.shards)
+        self.scan_counters = [self.ctx.Value('q', 0) for _ in self.shards]
+        self.restarts = 0
+        self.start_time = None
+
+    def start_worker(self, index):
+        process = self.ctx.Process(
+            target=worker_main,
+            args=(index, self.shards[index], self.db_path, self.scan_counters[index]),
+            name=f"shift-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self.workers[index] = process
+        log.info(f"✅ Worker {index} started (pid {process.pid}, {len(self.shards[index])} roster(s))",
+                 extra=fields(event="worker_start", worker=index, pid=process.pid, rosters=len(self.shards[index])))
+
+    def run(self):
+        self.start_time = time.time()
+        deadline = self.start_time + MAX_RUNTIME_HOURS * 3600
+
+        # Create the schema once before workers race to open the database
+        ShiftStore(self.db_path).close()
+
+        for index in range(len(self.shards)):
+            self.start_worker(index)
+
+        last_report = time.time()
+        last_scans = 0
+        while time.time() < deadline:
+            time.sleep(CHECK_INTERVAL)
+
+            for index, process in enumerate(self.workers):
+                if not process.is_alive():
+                    log.warning(f"⚠️  Worker {index} exited with code {process.exitcode}, restarting...",
+                                extra=fields(event="worker_exit", worker=index, exitcode=process.exitcode))
+                    self.restarts += 1
+                    time.sleep(RESTART_BACKOFF)
+                    self.start_worker(index)
+
+            if time.time() - last_report >= REPORT_INTERVAL:
+                scans = self.total_scans()
+                rate = (scans - last_scans) / (time.time() - last_report)
+                log.info(f"📈 {rate:.2f} rosters/s across {len(self.workers)} worker(s) "
+                         f"({scans} scans, {self.restarts} restarts)",
+                         extra=fields(event="throughput", rate=round(rate, 3), scans=scans, restarts=self.restarts))
+                last_report = time.time()
+                last_scans = scans
+
+        log.info(f"⏰ Maximum runtime ({MAX_RUNTIME_HOURS} hours) reached")
+
+    def total_scans(self):
+        return sum(counter.value for counter in self.scan_counters)
+
+    def stop(self):
+        for process in self.workers:
+            if process and process.is_alive():
+                process.terminate()
+        for process in self.workers:
+            if process:
+                process.join(timeout=10)
+
+        runtime = time.time() - self.start_time if self.start_time else 0
+        lines = [
+            "📊 FINAL STATISTICS:",
+            f"   Total runtime: {runtime / 3600:.1f} hours",
+            f"   Total scans: {self.total_scans()}",
+            f"   Worker restarts: {self.restarts}"
+        ]
+        for index, counter in enumerate(self.scan_counters):
+            lines.append(f"     Worker {index}: {counter.value} scans over {len(self.shards[index])} roster(s)")
+        log.info("\n".join(lines), extra=fields(event="stop", runtime=round(runtime), scans=self.total_scans(),
+                                                restarts=self.restarts,
+                                                worker_scans=[counter.value for counter in self.scan_counters]))
+
+
+# ================= MAIN =================
+def main():
+    claimer_log.setup()
+    supervisor = ShiftSupervisor(SHIFT_URLS)
+    log.info(f"🚀 Sharded supervisor starting: {len(SHIFT_URLS)} roster(s) across {len(supervisor.shards)} worker(s)",
+             extra=fields(event="start", rosters=len(SHIFT_URLS), workers=len(supervisor.shards),
+                          max_runtime_hours=MAX_RUNTIME_HOURS))
+
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        log.info("👋 Manual stop requested")
+    finally:
+        supervisor.stop()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
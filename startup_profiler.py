@@ -0,0 +1,80 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ================= STARTUP PROFILER =================
+class StartupProfiler:
+    """Breaks the time from launch to the end of the first scan down by phase.
+
+    Steps on the main thread are timed with phase(). Work started with
+    background() runs on its own thread alongside them. Only the time the main
+    thread then spends in join() waiting for it counts towards the time to
+    first scan; its full duration is listed as overlapped. Whatever time is
+    not covered by a phase when finish() is called is reported as the first
+    scan itself.
+    """
+
+    def __init__(self, kind, started=None):
+        self.kind = kind
+        now = time.perf_counter()
+        self.start = now - (time.time() - started) if started else now
+        self.mark = now
+        self.phases = []
+        self.overlapped = []
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @contextmanager
+    def phase(self, name):
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, phase_start)
+
+    def add(self, name, phase_start):
+        self.mark = time.perf_counter()
+        self.phases.append((name, self.mark - phase_start))
+
+    def background(self, name, target):
+        """Run target on a thread while startup continues; pass the result to join()"""
+        outcome = {'name': name}
+
+        def run():
+            run_start = time.perf_counter()
+            try:
+                target()
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                outcome['seconds'] = time.perf_counter() - run_start
+
+        thread = threading.Thread(target=run, name=f"startup-{name}", daemon=True)
+        thread.start()
+        outcome['thread'] = thread
+        return outcome
+
+    def join(self, outcome):
+        """Wait for background work; re-raises its exception"""
+        with self.phase(f"{outcome['name']} wait"):
+            outcome['thread'].join()
+        self.overlapped.append((outcome['name'], outcome['seconds']))
+        if 'error' in outcome:
+            raise outcome['error']
+
+    def finish(self):
+        """Close the profile with the first scan; returns the time to first scan"""
+        self.add("first scan", self.mark)
+        return self.elapsed()
+
+    def report(self):
+        """One line per phase with its time and share of the time to first scan"""
+        total = self.elapsed() or 1.0
+        lines = [f"   {name:<12} {seconds:6.2f}s {seconds / total:4.0%}" for name, seconds in self.phases]
+        lines += [f"   {name:<12} {seconds:6.2f}s  (overlapped)" for name, seconds in self.overlapped]
+        unaccounted = total - sum(seconds for _, seconds in self.phases)
+        if unaccounted >= 0.01:
+            lines.append(f"   {'other':<12} {unaccounted:6.2f}s {unaccounted / total:4.0%}")
+        return "\n".join(lines)
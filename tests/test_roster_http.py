@@ -0,0 +1,126 @@
+"""Checks the HTTP poller's revalidation and keep-alive against a stand-in server.
+
+The server serves the benchmark's synthetic roster with an ETag, answers a
+matching If-None-Match with 304, and records the client port of every
+request so the test can tell a reused connection from a new one.
+"""
+import gzip
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from render_shift_claimer import RenderShiftAutoClaimer
+from roster_fixtures import generate_roster_html
+from roster_http import ConnectionPool, RosterHttpPoller
+
+SHIFT_COUNT = 20
+
+
+# ================= STAND-IN SERVER =================
+class RevalidatingServer:
+    """Serves /roster with ETag "v<version>"; drop_connections closes each connection after one response"""
+
+    def __init__(self):
+        server = self
+        self.version = 1
+        self.drop_connections = False
+        self.requests = []  # (client port, If-None-Match, status)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                etag = f'"v{server.version}"'
+                status = 304 if self.headers.get("If-None-Match") == etag else 200
+                server.requests.append((self.client_address[1], self.headers.get("If-None-Match"), status))
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                if status == 304:
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                else:
+                    body = gzip.compress(generate_roster_html(SHIFT_COUNT, seed=server.version).encode())
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Encoding", "gzip")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                # Closing without a Connection: close header looks like a server dropping an idle connection
+                self.close_connection = server.drop_connections
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def ports(self):
+        return {port for port, _, _ in self.requests}
+
+
+@pytest.fixture
+def server():
+    stand_in = RevalidatingServer()
+    stand_in.thread.start()
+    yield stand_in
+    stand_in.httpd.shutdown()
+    stand_in.httpd.server_close()
+
+
+@pytest.fixture
+def poller(server):
+    roster_poller = RosterHttpPoller(server.url("/roster"), RenderShiftAutoClaimer.generate_shift_id,
+                                     RenderShiftAutoClaimer.is_shift_text, pool=ConnectionPool())
+    yield roster_poller
+    roster_poller.close()
+
+
+# ================= TESTS =================
+def test_unchanged_roster_is_revalidated(server, poller):
+    changed, shifts = poller.poll()
+    assert changed
+    assert shifts
+
+    changed, unchanged = poller.poll()
+    assert not changed
+    assert unchanged is shifts
+    assert poller.not_modified == 1
+    assert server.requests[1][1:] == ('"v1"', 304)
+
+    server.version = 2
+    changed, _ = poller.poll()
+    assert changed
+    assert server.requests[2][1:] == ('"v1"', 200)
+    assert poller.etag == '"v2"'
+
+
+def test_polls_reuse_one_connection(server, poller):
+    for _ in range(4):
+        poller.poll()
+
+    assert poller.pool.requests == 4
+    assert poller.pool.reused == 3
+    assert len(server.ports()) == 1
+
+
+def test_dropped_connection_is_retried(server, poller):
+    server.drop_connections = True
+    poller.poll()
+    changed, _ = poller.poll()
+
+    # The second poll finds its pooled connection closed and retries on a new one
+    assert not changed
+    assert poller.not_modified == 1
+    assert poller.pool.requests == 2
+    assert poller.pool.reused == 0
+    assert len(server.ports()) == 2
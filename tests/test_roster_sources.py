@@ -0,0 +1,154 @@
+"""Cross-checks the network shift source against the DOM sources.
+
+A local ThreadingHTTPServer serves the benchmark's synthetic roster both as
+HTML (/roster) and as Deputy-style roster JSON (/api/roster), built from the
+same shifts. Every shift must get the same ID and status from the JSON as
+from the page: through the HTTP poller's HTML parser, and (when Chromium is
+available) through the in-page extraction with the network source capturing
+the page's own roster request.
+"""
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import shift_parser
+from render_shift_claimer import RenderShiftAutoClaimer
+from roster_fixtures import generate_roster_html, generate_roster_json
+from roster_http import RosterHttpPoller
+from roster_network import NetworkShiftSource
+
+SHIFT_COUNT = 20  # No two of these shifts share a date and time range (such shifts share an ID)
+AGREE = {'missing_in_network': [], 'missing_in_dom': [], 'status_mismatch': []}
+
+
+# ================= LOCAL ROSTER SERVER =================
+class RosterServer:
+    """Serves /roster?shifts=N (HTML that fetches its JSON) and /api/roster?shifts=N&localized=0|1"""
+
+    def __init__(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                count = int(query.get("shifts", [str(SHIFT_COUNT)])[0])
+                if parts.path == "/api/roster":
+                    localized = query.get("localized", ["1"])[0] == "1"
+                    body = generate_roster_json(count, localized=localized)
+                    self._send("application/json", body.encode())
+                else:
+                    body = generate_roster_html(count, json_url=f"/api/roster?shifts={count}")
+                    self._send("text/html; charset=utf-8", body.encode())
+
+            def _send(self, content_type, body):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+
+@pytest.fixture(scope="module")
+def server():
+    roster_server = RosterServer()
+    roster_server.thread.start()
+    yield roster_server
+    roster_server.httpd.shutdown()
+    roster_server.httpd.server_close()
+
+
+def scan_records(shifts):
+    """The record the scan keeps for each ID: the first one in document order, as in filter_new_shifts"""
+    kept = {}
+    for shift in shifts:
+        kept.setdefault(shift['id'], shift)
+    return list(kept.values())
+
+
+def network_source(server, path):
+    source = NetworkShiftSource()
+    with urlopen(server.url(path)) as response:
+        source.ingest(json.load(response))
+    return source
+
+
+# ================= TESTS =================
+def test_html_and_json_agree(server):
+    poller = RosterHttpPoller(server.url(f"/roster?shifts={SHIFT_COUNT}"),
+                              RenderShiftAutoClaimer.generate_shift_id, RenderShiftAutoClaimer.is_shift_text)
+    try:
+        _, html_shifts = poller.poll()
+    finally:
+        poller.close()
+    source = network_source(server, f"/api/roster?shifts={SHIFT_COUNT}")
+
+    assert len(source.shifts()) == SHIFT_COUNT
+    assert source.cross_check(scan_records(html_shifts)) == AGREE
+
+
+def test_unix_times_use_the_roster_zone(server):
+    """Without localized times, unix timestamps are shown in ROSTER_TIMEZONE, not the host's zone"""
+    localized = network_source(server, f"/api/roster?shifts={SHIFT_COUNT}")
+    source = NetworkShiftSource(roster_timezone="Etc/GMT+5")  # UTC-5, the fixture's zone
+    with urlopen(server.url(f"/api/roster?shifts={SHIFT_COUNT}&localized=0")) as response:
+        source.ingest(json.load(response))
+
+    assert set(source.shifts_by_id) == set(localized.shifts_by_id)
+
+
+def test_unix_times_follow_a_localized_offset():
+    """A localized time earlier in the payload sets the offset for bare unix times"""
+    payload = json.loads(generate_roster_json(SHIFT_COUNT))
+    expected = NetworkShiftSource()
+    expected.ingest(payload)
+    # Only the first object, which is ingested first, keeps its localized times
+    for roster in payload['Rosters'][1:]:
+        del roster['StartTimeLocalized'], roster['EndTimeLocalized']
+    source = NetworkShiftSource()
+    source.ingest(payload)
+
+    assert set(source.shifts_by_id) == set(expected.shifts_by_id)
+
+
+def test_browser_dom_and_network_agree(server):
+    sync_api = pytest.importorskip("playwright.sync_api")
+    url = server.url(f"/roster?shifts={SHIFT_COUNT}")
+    with sync_api.sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])
+        except Exception as e:
+            pytest.skip(f"Chromium is not available: {str(e).splitlines()[0]}")
+        try:
+            page = browser.new_page()
+            source = NetworkShiftSource()
+            source.attach(page)
+            page.goto(url, wait_until="networkidle")
+            claimer = RenderShiftAutoClaimer(url)
+            claimer.row_selector = None
+            dom_shifts = claimer.extract_dom_shifts(page)
+        finally:
+            browser.close()
+
+    assert source.has_data
+    assert len(source.shifts()) == SHIFT_COUNT
+    assert source.cross_check(scan_records(dom_shifts)) == AGREE
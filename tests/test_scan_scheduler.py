@@ -0,0 +1,121 @@
+"""Replays AdaptiveScanScheduler decisions on a fake clock.
+
+The rng is fixed at 0.5, which makes the jitter zero, so every interval is
+exact. Timestamps are built with time.mktime because the histograms bucket
+by local hour and weekday.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scan_scheduler
+from scan_scheduler import AdaptiveScanScheduler
+
+BASE_INTERVAL = 30
+MONDAY_9AM = time.mktime((2026, 1, 5, 9, 0, 0, 0, 0, -1))
+THURSDAY_3AM = time.mktime((2026, 1, 8, 3, 0, 0, 0, 0, -1))
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(now=MONDAY_9AM):
+    clock = FakeClock(now)
+    return AdaptiveScanScheduler(BASE_INTERVAL, clock=clock, rng=lambda: 0.5), clock
+
+
+def monday_postings(count=20):
+    """count posting events on Mondays at 9:00, one week apart"""
+    return [MONDAY_9AM - week * 7 * 86400 for week in range(count)]
+
+
+# ================= TESTS =================
+def test_first_scan_is_not_a_posting():
+    scheduler, _ = make_scheduler()
+    scheduler.record_scan(12)
+
+    assert scheduler.total == 0
+    assert scheduler.next_interval().mode == "idle"
+
+    scheduler.record_scan(1)
+    assert scheduler.total == 1
+    assert scheduler.next_interval().mode == "burst"
+
+
+def test_burst_expires():
+    scheduler, clock = make_scheduler()
+    scheduler.record_scan(0)
+    scheduler.record_scan(1)
+
+    decision = scheduler.next_interval()
+    assert decision.mode == "burst"
+    assert decision.interval == scheduler.min_interval
+
+    clock.now += scheduler.burst_seconds - 1
+    assert scheduler.next_interval().mode == "burst"
+    clock.now += 1
+    assert scheduler.next_interval().mode == "idle"
+
+
+def test_hot_window_scans_faster():
+    scheduler, _ = make_scheduler(MONDAY_9AM)
+    scheduler.observe(monday_postings())
+
+    decision = scheduler.next_interval()
+    assert decision.lift >= scan_scheduler.HOT_LIFT
+    assert decision.mode == "hot"
+    # The lift is capped so the interval never drops below min_interval
+    assert decision.interval == scheduler.min_interval
+
+
+def test_cold_window_scans_slower():
+    scheduler, _ = make_scheduler(THURSDAY_3AM)
+    scheduler.observe(monday_postings())
+
+    decision = scheduler.next_interval()
+    assert decision.lift <= scan_scheduler.COLD_LIFT
+    assert decision.mode == "cold"
+    assert decision.interval == pytest.approx(BASE_INTERVAL * scan_scheduler.COLD_FACTOR)
+
+
+def test_short_history_is_neutral():
+    scheduler, _ = make_scheduler(THURSDAY_3AM)
+    scheduler.observe(monday_postings(scan_scheduler.MIN_HISTORY - 1))
+
+    assert scheduler.lift() == 1.0
+    assert scheduler.next_interval().mode == "idle"
+
+
+@pytest.mark.parametrize("now", [MONDAY_9AM, THURSDAY_3AM])
+def test_idle_back_off_is_capped(now):
+    scheduler, _ = make_scheduler(now)
+    if now == THURSDAY_3AM:
+        scheduler.observe(monday_postings())
+    scheduler.record_scan(0)
+    for _ in range(30):
+        scheduler.record_scan(0)
+
+    decision = scheduler.next_interval()
+    assert decision.mode in ("idle", "cold")
+    assert decision.interval == pytest.approx(BASE_INTERVAL * scan_scheduler.MAX_IDLE_FACTOR)
+
+
+def test_postings_close_together_count_once():
+    scheduler, _ = make_scheduler()
+    gap = scan_scheduler.POSTING_GAP
+    # A chain of shifts each within the gap of the one before is one posting
+    scheduler.observe([MONDAY_9AM, MONDAY_9AM + gap, MONDAY_9AM + 2 * gap, MONDAY_9AM + 3 * gap + 1])
+
+    assert scheduler.total == 2
+    assert sum(scheduler.hour_counts) == 2
+    assert sum(scheduler.day_counts) == 2